@@ -9,5 +9,8 @@ setup(
     author_email='zach@sotaog.com',
     license='MIT',
     packages=['sotaog_public_api_client'],
-    install_requires=['requests']
+    install_requires=['requests', 'futures; python_version < "3"'],
+    extras_require={
+        'financials': ['numpy']
+    }
 )
@@ -1,279 +1,247 @@
-import csv
+import copy
 import logging
 import os
+import threading
 
-import requests
+from ._concurrency import run_concurrently
+from .endpoints import ENDPOINTS
 
 logger = logging.getLogger('sotaog_public_api_client')
-logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
 
 
 class Client_Exception(Exception):
-  pass
-
-
-class Client():
-  def __init__(self, url, client_id, client_secret, customer_id = None):
-    self.session = requests.Session()
+  def __init__(self, message, status_code = None):
+    super(Client_Exception, self).__init__(message)
+    self.status_code = status_code
+
+
+RECORD_MODES = (None, 'records', 'columns')
+
+
+def _response_body(result):
+  try:
+    return result.json()
+  except ValueError:
+    return result.content
+
+
+def _merge_asset_datatypes(asset_datatypes_list):
+  merged = {}
+  for asset_datatypes in asset_datatypes_list:
+    for asset_id, datatypes in asset_datatypes.items():
+      if not isinstance(datatypes, (list, tuple)):
+        datatypes = [datatypes]
+      merged_datatypes = merged.setdefault(asset_id, [])
+      merged_datatypes.extend(datatype for datatype in datatypes if datatype not in merged_datatypes)
+  return merged
+
+
+def _select_datatypes(series, datatypes):
+  if not isinstance(series, dict):
+    series = {}
+  return {datatype: series.get(datatype) for datatype in datatypes}
+
+
+class _Connection(object):
+  def __init__(self, url, client_id, client_secret, session = None, pool_maxsize = None):
+    self.url = url
+    self.client_id = client_id
+    self.client_secret = client_secret
+    self.pool_maxsize = pool_maxsize
+    self.token = None
+    self._session = session
+    self._lock = threading.Lock()
+    self._session_lock = threading.Lock()
+
+  @property
+  def session(self):
+    if self._session is None:
+      with self._session_lock:
+        if self._session is None:
+          import requests
+          session = requests.Session()
+          if self.pool_maxsize:
+            adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.pool_maxsize)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+          self._session = session
+    return self._session
+
+  @session.setter
+  def session(self, session):
+    self._session = session
+
+  def authenticate(self):
+    with self._lock:
+      if self.token is None:
+        logger.debug('Authenticating to API: %s', self.url)
+        data = {
+            'grant_type': 'client_credentials'
+        }
+        result = self.session.request('POST', '{}/v1/authenticate'.format(self.url), data=data,
+                                      auth=(self.client_id, self.client_secret))
+        if result.status_code == 200:
+          self.token = result.json()['access_token']
+          logger.debug('Token: %s', self.token)
+        else:
+          raise Client_Exception('Unable to authenticate to API', status_code=result.status_code)
+      return self.token
+
+
+class Client(object):
+  def __init__(self, url, client_id, client_secret, customer_id = None, session = None, pool_maxsize = None):
+    if logger.level == logging.NOTSET:
+      logger.setLevel(os.getenv('LOG_LEVEL', 'INFO'))
     self.url = url.rstrip('/')
     self.customer_id = customer_id
+    self._connection = _Connection(self.url, client_id, client_secret, session=session, pool_maxsize=pool_maxsize)
+    self._headers = None
+    self._headers_key = None
+    self._snapshot_cache = None
+    self._snapshot_lock = threading.Lock()
     logger.info('Initializing Sotaog API client for {}'.format(url))
-    logger.debug('Authenticating to API: {}'.format(url))
-    data = {
-        'grant_type': 'client_credentials'
-    }
-    result = self.session.post('{}/v1/authenticate'.format(self.url), data=data, auth=(client_id, client_secret))
-    if result.status_code == 200:
-      self.token = result.json()['access_token']
-      logger.debug('Token: {}'.format(self.token))
-    else:
-      raise Client_Exception('Unable to authenticate to API')
+
+  @property
+  def session(self):
+    return self._connection.session
+
+  @session.setter
+  def session(self, session):
+    self._connection.session = session
+
+  @property
+  def token(self):
+    return self._connection.token or self._connection.authenticate()
+
+  @token.setter
+  def token(self, token):
+    self._connection.token = token
+
+  def authenticate(self):
+    return self._connection.authenticate()
+
+  def for_customer(self, customer_id):
+    logger.debug('Creating client view for customer {}'.format(customer_id))
+    view = copy.copy(self)
+    view.customer_id = customer_id
+    view._snapshot_cache = None
+    view._snapshot_lock = threading.Lock()
+    return view
+
+  def snapshot_cache(self, interval = None, on_change = None):
+    # The cache is shared, so later calls may omit the arguments but cannot change them.
+    with self._snapshot_lock:
+      if self._snapshot_cache is None:
+        from .snapshots import SnapshotCache
+        self._snapshot_cache = SnapshotCache(self, interval=interval or 30, on_change=on_change).start()
+      elif ((interval is not None and interval != self._snapshot_cache.interval)
+            or (on_change is not None and on_change is not self._snapshot_cache.on_change)):
+        raise ValueError('Snapshot cache already started with different interval or on_change')
+      return self._snapshot_cache
 
   def _get_headers(self):
-    headers = {
-        'authorization': 'Bearer {}'.format(self.token)
-    }
-    if self.customer_id:
-      headers['x-sotaog-customer-id'] = self.customer_id
-    return headers
+    key = (self.token, self.customer_id)
+    if self._headers_key != key:
+      headers = {
+          'authorization': 'Bearer {}'.format(self.token)
+      }
+      if self.customer_id:
+        headers['x-sotaog-customer-id'] = self.customer_id
+      self._headers = headers
+      self._headers_key = key
+    return self._headers
+
+  def _call(self, name, json = None, data = None, headers = None, record_mode = None, **args):
+    if record_mode not in RECORD_MODES:
+      raise Client_Exception('Unknown record_mode {!r}, expected one of {}'.format(record_mode, RECORD_MODES))
+    endpoint = ENDPOINTS[name]
+    url = self.url + endpoint.format_path(args)
+    if headers is None:
+      headers = self._get_headers()
+    logger.debug('%s %s', endpoint.verb, url)
+    result = self.session.request(endpoint.verb, url, headers=headers, params=endpoint.format_params(args),
+                                  json=json, data=data)
+    if result.status_code not in endpoint.expected:
+      logger.debug('%s %s returned %s: %s', endpoint.verb, url, result.status_code, _response_body(result))
+      raise Client_Exception(endpoint.error.format(**args), status_code=result.status_code)
+    if record_mode:
+      from . import records
+      response = endpoint.decode(result, records.object_pairs_hook)
+      if record_mode == 'columns' and isinstance(response, list):
+        response = records.to_columns(response)
+    else:
+      response = endpoint.decode(result)
+    logger.debug('%s: %s', name, response)
+    return response
 
   def get_alarm_services(self):
-    logger.debug('Getting alarm services')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/alarm-services'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      alarm_services = result.json()
-      logger.debug('Alarm Services: {}'.format(alarm_services))
-      return alarm_services
-    else:
-      raise Client_Exception('Unable to retrieve alarm services')
+    return self._call('get_alarm_services')
 
   def get_alarm_service(self, alarm_service_id):
-    logger.debug('Getting alarm service {}'.format(alarm_service_id))
-    headers = self._get_headers()
-    url = '{}/v1/alarm-services/{}'.format(self.url, alarm_service_id)
-    result = self.session.get(url, headers=headers)
-    if result.status_code == 200:
-      alarm_service = result.json()
-      logger.debug('Alarm Service: {}'.format(alarm_service))
-      return alarm_service
-    else:
-      raise Client_Exception('Unable to retrieve alarm service {}'.format(alarm_service_id))
+    return self._call('get_alarm_service', alarm_service_id=alarm_service_id)
 
   def get_alarms(self):
-    logger.debug('Getting alarms')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/alarms'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      alarms = result.json()
-      logger.debug('Alarms: {}'.format(alarms))
-      return alarms
-    else:
-      raise Client_Exception('Unable to retrieve alarms')
-    
+    return self._call('get_alarms')
+
   def get_custom_alarms(self):
-    logger.debug('Getting alarms')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/custom-alarms'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      alarms = result.json()
-      logger.debug('Alarms: {}'.format(alarms))
-      return alarms
-    else:
-      raise Client_Exception('Unable to retrieve alarms')
-  
-  def get_custom_alarm(self,alarms_id):
-    logger.debug('Getting alarms')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/custom-alarms/{}'.format(self.url, alarms_id), headers=headers)
-    if result.status_code == 200:
-      alarms = result.json()
-      logger.debug('Alarms: {}'.format(alarms))
-      return alarms
-    else:
-      raise Client_Exception('Unable to retrieve alarms')
-  
-  def get_alarm_incidents(self,alarm_id, well_id, alarm_status):
-    logger.debug('Getting alarms')
-    headers = self._get_headers()
-    url = '{}/v1/custom-alarms-incidents?alarm_id={}&well_id={}&alarm_status={}'.format(self.url,alarm_id,well_id,alarm_status)   
-    result = self.session.get(url, headers=headers)
-    if result.status_code == 200:
-      alarms = result.json()
-      logger.debug('Alarms: {}'.format(alarms))
-      return alarms
-    else:
-      raise Client_Exception('Unable to retrieve alarms')
-  
+    return self._call('get_custom_alarms')
+
+  def get_custom_alarm(self, alarms_id):
+    return self._call('get_custom_alarm', alarms_id=alarms_id)
+
+  def get_alarm_incidents(self, alarm_id, well_id, alarm_status):
+    return self._call('get_alarm_incidents', alarm_id=alarm_id, well_id=well_id, alarm_status=alarm_status)
+
   def post_custom_alarm_incidents(self, incidents):
-    logger.debug('Creating Alarm Incidents {}'.format(incidents))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/custom-alarms-incidents'.format(self.url), headers=headers, json=incidents)
-    if result.status_code == 201:
-      created = result.json()
-      logger.debug('Alarms Incidents: {}'.format(created))
-      return created
-    else:
-      raise Client_Exception('Unable to create Alarm Incidents')
+    return self._call('post_custom_alarm_incidents', json=incidents)
 
   def get_alarm(self, asset_id, datatype = None):
-    logger.debug('Getting alarms for {}'.format(asset_id))
-    headers = self._get_headers()
-    url = '{}/v1/alarms/{}'.format(self.url, asset_id)
     if datatype:
-      url += '/{}'.format(datatype)
-    result = self.session.get(url, headers=headers)
-    if result.status_code == 200:
-      alarm = result.json()
-      logger.debug('Alarm: {}'.format(alarm))
-      return alarm
-    else:
-      raise Client_Exception('Unable to retrieve alarms for {}'.format(asset_id))
+      return self._call('get_alarm_datatype', asset_id=asset_id, datatype=datatype)
+    return self._call('get_alarm', asset_id=asset_id)
 
   def get_facilities(self):
-    logger.debug('Getting facilities')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/facilities'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      facilities = result.json()
-      logger.debug('Facilities: {}'.format(facilities))
-      return facilities
-    else:
-      raise Client_Exception('Unable to retrieve facilities')
+    return self._call('get_facilities')
 
   def get_facility(self, facility_id):
-    logger.debug('Getting facility: {}'.format(facility_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/facilities/{}'.format(self.url, facility_id), headers=headers)
-    if result.status_code == 200:
-      facility = result.json()
-      logger.debug('Facility: {}'.format(facility))
-      return facility
-    else:
-      raise Client_Exception('Unable to retrieve facility {}'.format(facility_id))
+    return self._call('get_facility', facility_id=facility_id)
 
   def get_facility_config(self, facility_id):
-    logger.debug('Getting config for {}'.format(facility_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/facilities/{}/config'.format(self.url, facility_id), headers=headers)
-
-    if result.status_code == 200:
-      config = result.json()
-      logger.debug('config: {}'.format(config))
-      return config
-    else:
-      raise Client_Exception('Unable to retrieve config')
+    return self._call('get_facility_config', facility_id=facility_id)
 
   def get_asset(self, asset_id, type = 'assets'):
-    logger.debug('Getting asset {} of type: {}'.format(asset_id, type))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/{}/{}'.format(self.url, type, asset_id), headers=headers)
-    if result.status_code == 200:
-      asset = result.json()
-      logger.debug('Asset: {}'.format(asset))
-      return asset
-    else:
-      raise Client_Exception('Unable to retrieve asset {} of type {}'.format(asset_id, type))
+    return self._call('get_asset', asset_id=asset_id, type=type)
 
   def get_assets(self, type = 'assets', facility = None, asset_type = None):
-    logger.debug('Getting assets of type: {}'.format(type))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/{}'.format(self.url, type), headers=headers)
-    if result.status_code == 200:
-      assets = result.json()
-      if facility:
-        assets = [asset for asset in assets if 'facility' in asset and asset['facility'] == facility]
-      if asset_type:
-        assets = [asset for asset in assets if 'asset_type' in asset and asset['asset_type'] == asset_type]
-      logger.debug('Assets: {}'.format(assets))
-      return assets
-    else:
-      raise Client_Exception('Unable to retrieve assets of type {}'.format(asset_type))
+    assets = self._call('get_assets', type=type)
+    if facility:
+      assets = [asset for asset in assets if 'facility' in asset and asset['facility'] == facility]
+    if asset_type:
+      assets = [asset for asset in assets if 'asset_type' in asset and asset['asset_type'] == asset_type]
+    return assets
 
   def get_asset_type(self, asset_type_id):
-    logger.debug('Getting asset type {}'.format(asset_type_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/asset-types/{}'.format(self.url, asset_type_id), headers=headers)
-    if result.status_code == 200:
-      asset_type = result.json()
-      logger.debug('Asset Type: {}'.format(asset_type))
-      return asset_type
-    else:
-      raise Client_Exception('Unable to retrieve asset {}'.format(asset_type_id))
+    return self._call('get_asset_type', asset_type_id=asset_type_id)
 
   def get_asset_types(self):
-    logger.debug('Getting asset types')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/asset-types'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      asset_types = result.json()
-      logger.debug('Asset types: {}'.format(asset_types))
-      return asset_types
-    else:
-      raise Client_Exception('Unable to get asset types')
+    return self._call('get_asset_types')
 
   def get_compressors(self):
-    logger.debug('Getting compressors')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/compressors'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      compressors = result.json()
-      logger.debug('Compressors: {}'.format(compressors))
-      return compressors
-    else:
-      raise Client_Exception('Unable to get compressors')
+    return self._call('get_compressors')
 
   def get_customers(self):
-    logger.debug('Getting customers')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/customers'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      customers = result.json()
-      logger.debug('Customers: {}'.format(customers))
-      return customers
-    else:
-      raise Client_Exception('Unable to get customers')
+    return self._call('get_customers')
 
   def get_customer(self, customer_id):
-    logger.debug('Getting customer {}'.format(customer_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/customers/{}'.format(self.url, customer_id), headers=headers)
-    if result.status_code == 200:
-      customer = result.json()
-      logger.debug('Customer: {}'.format(customer))
-      return customer
-    else:
-      raise Client_Exception('Unable to get customer {}'.format(customer_id))
+    return self._call('get_customer', customer_id=customer_id)
 
   def get_datatypes(self, group_by='asset'):
-    logger.debug('Getting datatypes')
-    headers = self._get_headers()
-    params = {}
-    if group_by:
-      params['group_by'] = group_by
-    result = self.session.get('{}/v1/datatypes'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      datatypes = result.json()
-      logger.debug('Datatypes: {}'.format(datatypes))
-      return datatypes
-    else:
-      raise Client_Exception('Unable to get datatypes')
+    return self._call('get_datatypes', group_by=group_by)
 
   def get_datatype(self, datatype_id):
-    logger.debug('Getting datatype {}'.format(datatype_id))
-    headers = self._get_headers()
-    params = {'group_by': 'asset'}
-    result = self.session.get('{}/v1/datatypes/{}'.format(self.url, datatype_id), headers=headers, params=params)
-    if result.status_code == 200:
-        datatype = result.json()
-        logger.debug('Datatype: {}'.format(datatype))
-        return datatype
-    else:
-        raise Client_Exception('Unable to get datatype {}'.format(datatype_id))
+    return self._call('get_datatype', datatype_id=datatype_id, group_by='asset')
 
   def get_datapoints(self, asset_datatypes, start_ts = None, end_ts = None, sort = 'desc', limit = 100):
-    logger.debug('Getting datapoints for asset_datatypes: {}'.format(asset_datatypes))
-    headers = self._get_headers()
     body = {
         'asset_datatypes': asset_datatypes
     }
@@ -285,607 +253,218 @@ class Client():
       body['sort'] = sort
     if limit:
       body['limit'] = limit
-    result = self.session.post('{}/v1/datapoints'.format(self.url), headers=headers, json=body)
-    if result.status_code == 200:
-      datapoints = result.json()
-      logger.debug('Datapoints: {}'.format(datapoints))
-      return datapoints
-    else:
-      logger.debug(result.json())
-      raise Client_Exception('Unable to get datapoints')
+    return self._call('get_datapoints', json=body)
+
+  def query_datapoints(self, queries, max_workers = 4):
+    # Queries sharing a window (start_ts, end_ts, sort, limit) are merged into a single POST. Queries with
+    # asset_datatypes in the {asset_id: [datatype, ...]} form always get back {asset_id: {datatype: datapoints}};
+    # any other form is sent on its own and gets the raw response.
+    groups = {}
+    for index, query in enumerate(queries):
+      window = (query.get('start_ts'), query.get('end_ts'), query.get('sort', 'desc'), query.get('limit', 100))
+      key = window if isinstance(query['asset_datatypes'], dict) else index
+      groups.setdefault(key, (window, []))[1].append(index)
+    groups = list(groups.values())
+    logger.debug('Querying datapoints for %s queries in %s requests', len(queries), len(groups))
+
+    def fetch(group):
+      (start_ts, end_ts, sort, limit), indices = group
+      if len(indices) == 1:
+        asset_datatypes = queries[indices[0]]['asset_datatypes']
+      else:
+        asset_datatypes = _merge_asset_datatypes(queries[index]['asset_datatypes'] for index in indices)
+      return self.get_datapoints(asset_datatypes, start_ts=start_ts, end_ts=end_ts, sort=sort, limit=limit)
+
+    results = [None] * len(queries)
+    for (_, indices), response in zip(groups, run_concurrently(fetch, groups, max_workers)):
+      for index in indices:
+        asset_datatypes = queries[index]['asset_datatypes']
+        if not isinstance(asset_datatypes, dict):
+          results[index] = response
+          continue
+        if not isinstance(response, dict):
+          raise Client_Exception('Unable to split datapoints response of type {}'.format(type(response).__name__))
+        results[index] = {asset_id: _select_datatypes(response.get(asset_id), datatypes)
+                          for asset_id, datatypes in _merge_asset_datatypes([asset_datatypes]).items()}
+    return results
 
   def get_oil_gas_price(self, start_date = None, end_date = None):
-    logger.debug('Getting prices')
-    headers = self._get_headers()
-    params = {}
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/financials/oil-gas-price'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      prices = result.json()
-      logger.debug('Oil Gas Prices: {}'.format(prices))
-      return prices
-    else:
-      raise Client_Exception('Unable to retrieve Oil Gas prices')
+    return self._call('get_oil_gas_price', start_date=start_date, end_date=end_date)
 
   def get_asset_datapoints(self, asset_id, datatypes = [], start_ts = None, end_ts = None, sort = 'desc', limit = 100):
-    logger.debug('Getting datapoints for asset: {}'.format(asset_id))
-    headers = self._get_headers()
-    params = {}
-    if datatypes:
-      params['datatypes'] = datatypes
-    if start_ts:
-      params['start_ts'] = start_ts
-    if end_ts:
-      params['end_ts'] = end_ts
-    if sort:
-      params['sort'] = sort
-    if limit:
-      params['limit'] = limit
-    result = self.session.get('{}/v1/datapoints/{}'.format(self.url, asset_id), headers=headers, params=params)
-    if result.status_code == 200:
-      datapoints = result.json()
-      logger.debug('Datapoints: {}'.format(datapoints))
-      return datapoints
-    else:
-      raise Client_Exception('Unable to get datapoints')
+    return self._call('get_asset_datapoints', asset_id=asset_id, datatypes=datatypes, start_ts=start_ts, end_ts=end_ts,
+                      sort=sort, limit=limit)
 
   def get_swd_networks(self, facility = None):
-    logger.debug('Getting SWD networks')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/swd-networks'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      swd_networks = result.json()
-      logger.debug('SWD Networks: {}'.format(swd_networks))
-      if facility:
-        swd_networks = [swd_network for swd_network in swd_networks if facility in swd_network['facilities']]
-      logger.debug('SWD Networks: {}'.format(swd_networks))
-      return swd_networks
-    else:
-      raise Client_Exception('Unable to retrieve SWD networks')
+    swd_networks = self._call('get_swd_networks')
+    if facility:
+      swd_networks = [swd_network for swd_network in swd_networks if facility in swd_network['facilities']]
+    return swd_networks
 
   def get_truck_tickets(self, facility = None, type = None, start_ts = None, end_ts = None):
-    logger.debug('Getting truck tickets')
-    headers = self._get_headers()
-    params = {}
-    if start_ts:
-      params['start_ts'] = start_ts
-    if end_ts:
-      params['end_ts'] = end_ts
-    if type:
-      params['type'] = type
-    if facility:
-      params['facility'] = facility
-    result = self.session.get('{}/v1/truck-tickets'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      truck_tickets = result.json()
-      logger.debug('Truck tickets: {}'.format(truck_tickets))
-      return truck_tickets
-    else:
-      raise Client_Exception('Unable to retrieve truck tickets')
+    return self._call('get_truck_tickets', facility=facility, type=type, start_ts=start_ts, end_ts=end_ts)
 
-  def get_auto_truck_tickets(self, facility = None, type = None, start_ts = None, end_ts = None):
-    logger.debug('Getting auto truck tickets')
-    headers = self._get_headers()
-    params = {}
-    if start_ts:
-      params['start_ts'] = start_ts
-    if end_ts:
-      params['end_ts'] = end_ts
-    if type:
-      params['type'] = type
-    if facility:
-      params['facility'] = facility
-    result = self.session.get('{}/v1/auto-truck-tickets'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      truck_tickets = result.json()
-      logger.debug('Auto Truck tickets: {}'.format(truck_tickets))
-      return truck_tickets
-    else:
-      raise Client_Exception('Unable to retrieve truck tickets')
+  def get_auto_truck_tickets(self, facility = None, type = None, start_ts = None, end_ts = None, record_mode = None):
+    return self._call('get_auto_truck_tickets', record_mode=record_mode, facility=facility, type=type, start_ts=start_ts,
+                      end_ts=end_ts)
 
   def post_truck_ticket(self, truck_ticket):
-    logger.debug('Creating truck ticket {}'.format(truck_ticket))
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/truck-tickets'.format(self.url), headers=headers, json=truck_ticket)
-    if result.status_code == 201:
-      created_ticket = result.json()
-      logger.debug('Truck ticket: {}'.format(created_ticket))
-      return created_ticket
-    else:
-      raise Client_Exception('Unable to create truck ticket')
+    return self._call('post_truck_ticket', json=truck_ticket)
 
   def post_auto_truck_ticket(self, truck_ticket):
-    logger.debug('Creating auto truck ticket {}'.format(truck_ticket))
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/auto-truck-tickets'.format(self.url), headers=headers, json=truck_ticket)
-    if result.status_code == 201:
-      created_ticket = result.json()
-      logger.debug('Auto Truck ticket: {}'.format(created_ticket))
-      return created_ticket
-    else:
-      raise Client_Exception('Unable to create auto truck ticket')
+    return self._call('post_auto_truck_ticket', json=truck_ticket)
 
   def put_truck_ticket(self, truck_ticket_id, timestamp,  truck_ticket):
-    logger.debug('Putting truck_ticket for {}'.format(truck_ticket_id))
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/truck-tickets/{}/{}'.format(self.url, truck_ticket_id, timestamp), headers=headers, json=truck_ticket)
-    if result.status_code != 201 and result.status_code != 200:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to update truck-ticket')
+    self._call('put_truck_ticket', json=truck_ticket, truck_ticket_id=truck_ticket_id, timestamp=timestamp)
 
   def put_truck_ticket_image(self, truck_ticket_id, timestamp, image, content_type):
-    logger.debug('Creating truck ticket image size {}, content_type {}'.format(len(image), content_type))
-    headers = self._get_headers()
+    headers = dict(self._get_headers())
     headers['content-type'] = content_type
-    result = self.session.put('{}/v1/truck-tickets/{}/{}/image'.format(self.url, truck_ticket_id, timestamp), headers=headers, data=image)
-    if result.status_code != 204:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to create truck ticket image')
+    self._call('put_truck_ticket_image', data=image, headers=headers, truck_ticket_id=truck_ticket_id,
+               timestamp=timestamp)
 
   def put_alarm(self, asset_id, datatype, alarm):
-    logger.debug('Creating alarm for {} {}'.format(asset_id, datatype))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/alarms/{}/{}'.format(self.url, asset_id, datatype), headers=headers, json=alarm)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Exception('Unable to create alarm')
+    self._call('put_alarm', json=alarm, asset_id=asset_id, datatype=datatype)
 
   def post_datapoints(self, asset_id, datapoints):
-    logger.debug('Posting datapoints')
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/datapoints/{}'.format(self.url, asset_id), headers=headers, json=datapoints)
-    if result.status_code != 202:
-      logger.exception(result.json())
-      raise Exception('Unable to post datapoints')
+    self._call('post_datapoints', json=datapoints, asset_id=asset_id)
 
   def batch_put_well_production(self, production):
-    logger.debug('Creating well production for {}'.format(production))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/wells/production'.format(self.url), headers=headers, json=production)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Exception('Unable to batch create well production')
-    
+    self._call('batch_put_well_production', json=production)
+
   def put_compressor_downtime(self, compressor):
-    logger.debug('Creating compressor downtime for {}'.format(compressor))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/compressors/downtime'.format(self.url), headers=headers, json=compressor)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Exception('Unable to create compressor downtime')
+    self._call('put_compressor_downtime', json=compressor)
 
   def put_well_production(self, well_id, date, production):
-    logger.debug('Creating well production for {} {}: {}'.format(well_id, date, production))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/wells/production/{}/{}'.format(self.url, well_id, date), headers=headers, json=production)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Exception('Unable to create well production')
+    self._call('put_well_production', json=production, well_id=well_id, date=date)
 
   def list_well_production(self, well_ids = None, facility_ids = None, start_date = None, end_date = None):
-    logger.debug('Getting well production')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/wells/production'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_production = result.json()
-      logger.debug('Well production: {}'.format(well_production))
-      return well_production
-    else:
-      raise Client_Exception('Unable to retrieve well production')
-    
+    return self._call('list_well_production', well_ids=well_ids, facility_ids=facility_ids, start_date=start_date,
+                      end_date=end_date)
+
   def list_well_optimised_production(self, well_ids = None, facility_ids = None):
-    logger.debug('Getting well optimised production')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-
-    result = self.session.get('{}/v1/wells/optimized-production'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_production = result.json()
-      logger.debug('Well optimised production: {}'.format(well_production))
-      return well_production
-    else:
-      raise Client_Exception('Unable to retrieve well optimised production')    
+    return self._call('list_well_optimised_production', well_ids=well_ids, facility_ids=facility_ids)
 
   def get_critical_rate_analysis(self, well_id, refresh = None, start_date = None, end_date = None):
-    logger.debug('Getting Critical Rate Data')
-    headers = self._get_headers()
-    params = {}
-    if refresh:
-      params['refresh'] = refresh
-    if start_date and end_date:
-      params['start_date'] = start_date
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/wells/{}/critical-rate-analysis'.format(self.url,well_id), headers=headers, params=params)
-    if result.status_code == 200:
-      well_mgmt = result.json()
-      logger.debug('Well Mgmt Data: {}'.format(well_mgmt))
-      return well_mgmt
-    else:
-      raise Client_Exception('Unable to retrieve Critical Rate Data')
-
-  def list_well_daily_warehouse(self, well_ids = None, facility_ids = None, start_date = None, end_date = None):
-    logger.debug('Getting well warehouse')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/wells/warehouse'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_warehouse = result.json()
-      logger.debug('Well warehouse: {}'.format(well_warehouse))
-      return well_warehouse
-    else:
-      raise Client_Exception('Unable to retrieve well warehouse')
+    if not (start_date and end_date):
+      start_date = end_date = None
+    return self._call('get_critical_rate_analysis', well_id=well_id, refresh=refresh, start_date=start_date,
+                      end_date=end_date)
+
+  def list_well_daily_warehouse(self, well_ids = None, facility_ids = None, start_date = None, end_date = None,
+                                record_mode = None):
+    return self._call('list_well_daily_warehouse', record_mode=record_mode, well_ids=well_ids, facility_ids=facility_ids,
+                      start_date=start_date, end_date=end_date)
 
   def list_well_status(self, well_ids = None):
-    logger.debug('Getting well status')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    result = self.session.get('{}/v1/wells/status/latest'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_status = result.json()
-      logger.debug('Well status: {}'.format(well_status))
-      return well_status
-    else:
-      raise Client_Exception('Unable to retrieve well status')
+    return self._call('list_well_status', well_ids=well_ids)
 
   def get_well_config(self, well_id):
-    logger.debug('Getting config for {}'.format(well_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/wells/{}/config'.format(self.url, well_id), headers=headers)
-
-    if result.status_code == 200:
-      config = result.json()
-      logger.debug('config: {}'.format(config))
-      return config
-    else:
-      raise Client_Exception('Unable to retrieve config')
+    return self._call('get_well_config', well_id=well_id)
 
   def get_well_type_curve(self, well_id):
-    logger.debug('Getting type curve for {}'.format(well_id))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/wells/{}/type-curve'.format(self.url, well_id), headers=headers)
-
-    if result.status_code == 200:
-      type_curve = result.json()
-      logger.debug('Type curve: {}'.format(type_curve))
-      return type_curve
-    else:
-      raise Client_Exception('Unable to retrieve type curve')
+    return self._call('get_well_type_curve', well_id=well_id)
 
   def get_type_curves(self, well_ids = None, facility_ids = None, lease_ids = None, start_date = None, end_date = None, combine = True):
-    logger.debug('Getting type curves')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-    if lease_ids:
-      params['lease_ids'] = lease_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    params['combine'] = combine
-    result = self.session.get('{}/v1/type-curves'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      curves = result.json()
-      logger.debug('Type curves: {}'.format(curves))
-      return curves
-    else:
-      raise Client_Exception('Unable to retrieve type curves')
+    return self._call('get_type_curves', well_ids=well_ids, facility_ids=facility_ids, lease_ids=lease_ids,
+                      start_date=start_date, end_date=end_date, combine=combine)
 
   def batch_well_type_curve(self, well_id, curves):
-    logger.debug('Creating type curve for {}'.format(well_id))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/wells/{}/type-curve'.format(self.url, well_id), headers=headers, json=curves)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to create well type curves')
+    self._call('batch_well_type_curve', json=curves, well_id=well_id)
 
   def get_well_tpr_ipr_curve(self, well_id, refresh):
-    logger.debug('Getting TPR/IPR curve for {}'.format(well_id))
-    headers = self._get_headers()
-    params = {}
-    if refresh:
-      params['refresh'] = refresh
-    result = self.session.get('{}/v1/wells/{}/tpr-ipr-curve'.format(self.url, well_id), headers=headers, params=params)
-    if result.status_code == 200:
-      data = result.json()
-      logger.debug('TPR/IPR curve data: {}'.format(data))
-      return data
-    else:
-      raise Client_Exception('Unable to retrieve IPR/TPR curve')
-      
+    return self._call('get_well_tpr_ipr_curve', well_id=well_id, refresh=refresh)
+
   def get_res_mgmt_plots(self, well_id, refresh):
-    logger.debug('Getting resevior mgmt plot data for {}'.format(well_id))
-    headers = self._get_headers()
-    params = {}
-    if refresh:
-      params['refresh'] = refresh
-    result = self.session.get('{}/v1/wells/{}/res_mgmt_plots'.format(self.url, well_id), headers=headers, params=params)
-    if result.status_code == 200:
-      data = result.json()
-      logger.debug('resevior mgmt plot data: {}'.format(data))
-      return data
-    else:
-      raise Client_Exception('Unable to retrieve resevior mgmt plot data')
-      
+    return self._call('get_res_mgmt_plots', well_id=well_id, refresh=refresh)
+
   def get_flowing_bottom_hole_pressure(self, well_id, refresh):
-    logger.debug('Getting flowing bottom hole pressure history for {}'.format(well_id))
-    headers = self._get_headers()
-    params = {}
-    if refresh:
-      params['refresh'] = refresh
-    result = self.session.get('{}/v1/wells/{}/flowing-bottom-hole-pressure'.format(self.url, well_id), headers=headers, params=params)
-    if result.status_code == 200:
-      data = result.json()
-      logger.debug('flowing bottom hole pressure history: {}'.format(data))
-      return data
-    else:
-      raise Client_Exception('Unable to retrieve flowing bottom hole pressure history')
+    return self._call('get_flowing_bottom_hole_pressure', well_id=well_id, refresh=refresh)
 
   def get_financials_categories(self):
-    logger.debug('Getting financials categories')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/financials-categories'.format(self.url), headers=headers)
-
-    if result.status_code == 200:
-      categories = result.json()
-      logger.debug('Financials Categories: {}'.format(categories))
-      return categories
-    else:
-      raise Client_Exception('Unable to retrieve financials categories')
+    return self._call('get_financials_categories')
 
   def post_financials_category(self, category):
-    logger.debug('Creating financials category {}'.format(category))
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/financials-categories'.format(self.url), headers=headers, json=category)
-    if result.status_code == 201:
-      created = result.json()
-      logger.debug('Financials Category: {}'.format(created))
-      return created
-    else:
-      raise Client_Exception('Unable to create financials categories')
+    return self._call('post_financials_category', json=category)
 
   def post_financials_category_price(self, price):
-    logger.debug('Creating financials category price {}'.format(price))
-    headers = self._get_headers()
-    result = self.session.post('{}/v1/financials-categories-price'.format(self.url), headers=headers, json=price)
-    if result.status_code == 201:
-      created = result.json()
-      logger.debug('Financials Category Price: {}'.format(created))
-      return created
-    else:
-      raise Client_Exception('Unable to create financials categories price')
+    return self._call('post_financials_category_price', json=price)
 
   def get_well_financials_category_prices(self, date, well_ids = None):
-    logger.debug('Getting financials categories prices')
-    headers = self._get_headers()
-    params = {'date': date}
-    if well_ids:
-      params['well_ids'] = well_ids
-    result = self.session.get('{}/v1/financials-categories-well-price'.format(self.url), headers=headers, params=params)
-
-    if result.status_code == 200:
-      categories = result.json()
-      logger.debug('Financials Categories: {}'.format(categories))
-      return categories
-    else:
-      raise Client_Exception('Unable to retrieve financials categories')
+    return self._call('get_well_financials_category_prices', date=date, well_ids=well_ids)
 
   def put_financials(self, type, type_id, month, financials):
-    logger.debug('Putting financials for {} {} {}'.format(type, type_id, month))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/financials/{}/{}/{}'.format(self.url, type, type_id, month), headers=headers, json=financials)
-    if result.status_code not in [200, 201]:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to put financials')
+    self._call('put_financials', json=financials, type=type, type_id=type_id, month=month)
 
   def get_financials(self, asset_type = 'wells', type = 'production', well_ids = None, facility_ids = None, lease_ids = None, start_date = None, end_date = None, start_month = None, end_month = None):
-    logger.debug('Getting type financials')
-    headers = self._get_headers()
-    params = {'asset_type': asset_type}
-    params = {'type': type}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-    if lease_ids:
-      params['lease_ids'] = lease_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    if start_month:
-      params['start_month'] = start_month
-    if end_month:
-      params['end_month'] = end_month
-    result = self.session.get('{}/v1/financials/{}'.format(self.url, asset_type), headers=headers, params=params)
-    if result.status_code == 200:
-      financials = result.json()
-      logger.debug('type financials: {}'.format(financials))
-      return financials
-    else:
-      raise Client_Exception('Unable to retrieve type financials')
+    return self._call('get_financials', asset_type=asset_type, type=type, well_ids=well_ids, facility_ids=facility_ids,
+                      lease_ids=lease_ids, start_date=start_date, end_date=end_date, start_month=start_month,
+                      end_month=end_month)
 
   def put_facility_config(self, facility_id, config):
-    logger.debug('Putting config for {}'.format(facility_id))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/facilities/{}/config'.format(self.url, facility_id), headers=headers, json=config)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to put facility config')
+    self._call('put_facility_config', json=config, facility_id=facility_id)
 
   def put_facility_sales(self, facility_id, month, sales):
-    logger.debug('Putting sales for {} {}'.format(facility_id, month))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/facilities/sales/{}/{}'.format(self.url, facility_id, month), headers=headers, json=sales)
-    if result.status_code not in [200, 201]:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to put sales')
+    self._call('put_facility_sales', json=sales, facility_id=facility_id, month=month)
 
   def list_well_sales(self, well_ids=None, start_date=None, end_date=None):
-    logger.debug('Getting well sales')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/wells/sales/daily'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_sales = result.json()
-      logger.debug('Well production: {}'.format(well_sales))
-      return well_sales
-    else:
-      raise Client_Exception('Unable to retrieve well sales')
+    return self._call('list_well_sales', well_ids=well_ids, start_date=start_date, end_date=end_date)
 
   def put_well_config(self, well_id, config):
-    logger.debug('Putting config for {}'.format(well_id))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/wells/{}/config'.format(self.url, well_id), headers=headers, json=config)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Client_Exception('Unable to put well config')
-    
+    self._call('put_well_config', json=config, well_id=well_id)
+
   def get_strapping_table(self, asset_id, type = 'tanks'):
-    logger.debug('Getting strapping table for {} of type: {}'.format(asset_id, type))
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/{}/{}/strapping'.format(self.url, type, asset_id), headers=headers)
-    if result.status_code == 200:
-      strapping_table = result.content.decode()
-      logger.debug('Strapping Table: {}'.format(strapping_table))
-      reader = csv.reader(strapping_table.split('\n'), delimiter=',')
-      strapping_table = {float(row[0]):float(row[1]) for row in reader}
-      logger.debug('Strapping Table: {}'.format(strapping_table))
-      return strapping_table
-    else:
-      raise Client_Exception('Unable to retrieve strapping table for asset {} of type {}'.format(asset_id, type))
+    import csv
+    strapping_table = self._call('get_strapping_table', asset_id=asset_id, type=type).decode()
+    reader = csv.reader(strapping_table.split('\n'), delimiter=',')
+    return {float(row[0]):float(row[1]) for row in reader}
 
   def batch_put_well_datapoint(self, datapoint):
-    logger.debug('Creating well datapoint for {}'.format(datapoint))
-    headers = self._get_headers()
-    result = self.session.put('{}/v1/wells/datapoint'.format(self.url), headers=headers, json=datapoint)
-    if result.status_code != 201:
-      logger.exception(result.json())
-      raise Exception('Unable to batch create well datapoint')
+    self._call('batch_put_well_datapoint', json=datapoint)
 
   def get_well_datapoint(self, well_ids = None, datapoints = None, timestamps = None):
-    logger.debug('Getting well datapoint')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if datapoints:
-      params['datapoints'] = datapoints
-    if timestamps:
-      params['timestamps'] = timestamps
-    result = self.session.get('{}/v1/wells/datapoint'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      well_datapoint = result.json()
-      logger.debug('Well datapoint: {}'.format(well_datapoint))
-      return well_datapoint
-    else:
-      raise Client_Exception('Unable to retrieve well datapoint')
-      
+    return self._call('get_well_datapoint', well_ids=well_ids, datapoints=datapoints, timestamps=timestamps)
+
   def get_custom_reports(self):
-    logger.debug('Getting custom reports list')
-    headers = self._get_headers()
-    result = self.session.get('{}/v1/custom_reports'.format(self.url), headers=headers)
-    if result.status_code == 200:
-      reports = result.json()
-      logger.debug('custom reports: {}'.format(reports))
-      return reports
-    else:
-      raise Client_Exception('Unable to retrieve custom reports list')
-  
-  def list_report_tank_gauge(self, well_ids = None, start_date = None, end_date = None):
-    logger.debug('Getting tank gauge report list')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if start_date:
-      params['start_date'] = start_date
-    if end_date:
-      params['end_date'] = end_date
-    result = self.session.get('{}/v1/wells/report/tank-gauge'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      reports = result.json()
-      logger.debug('custom reports: {}'.format(reports))
-      return reports
-    else:
-      raise Client_Exception('Unable to retrieve tank gauge report list')
-
-  def list_monthly_oil_report(self, facility_ids = None, start_month = None, end_month = None):
-    logger.debug('Getting oil report list')
-    headers = self._get_headers()
-    params = {}
-    if facility_ids:
-      params['facility_ids'] = facility_ids
-    if start_month:
-      params['start_month'] = start_month
-    if end_month:
-      params['end_month'] = end_month
-    result = self.session.get('{}/v1/facilities/report/oil'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      reports = result.json()
-      logger.debug('oil reports: {}'.format(reports))
-      return reports
-    else:
-      raise Client_Exception('Unable to retrieve oil report list')
+    return self._call('get_custom_reports')
+
+  def list_report_tank_gauge(self, well_ids = None, start_date = None, end_date = None, record_mode = None):
+    return self._call('list_report_tank_gauge', record_mode=record_mode, well_ids=well_ids, start_date=start_date,
+                      end_date=end_date)
+
+  def list_monthly_oil_report(self, facility_ids = None, start_month = None, end_month = None, record_mode = None):
+    return self._call('list_monthly_oil_report', record_mode=record_mode, facility_ids=facility_ids, start_month=start_month,
+                      end_month=end_month)
 
   def send_sms(self, to_numbers, sms_text):
-    logger.debug('Sending sms to {}'.format(to_numbers))
-    headers = self._get_headers()
     body = { 'to_numbers': to_numbers, 'text': sms_text }
-    result = self.session.post('{}/v1/sms'.format(self.url), headers=headers, json=body)
-    if result.status_code == 200:
-      response = result.json()
-      return response
-    else:
-      raise Client_Exception('Unable to send sms')
-  
+    return self._call('send_sms', json=body)
+
   def get_today_predicted(self, well_ids = None, refresh = False):
-    logger.debug('Getting today predicted')
-    headers = self._get_headers()
-    params = {}
-    if well_ids:
-      params['well_ids'] = well_ids
-    if refresh:
-      params['refresh'] = refresh
-    result = self.session.get('{}/v1/wells/production/today-prediction'.format(self.url), headers=headers, params=params)
-    if result.status_code == 200:
-      response = result.json()
-      logger.debug('Today predicted: {}'.format(response))
-      return response
-    else:
-      raise Client_Exception('Unable to retrieve today predicted')    
+    return self._call('get_today_predicted', well_ids=well_ids, refresh=refresh)
+
+
+class ClientPool():
+  def __init__(self, url, client_id, client_secret, max_workers = 10, session = None):
+    self.max_workers = max_workers
+    self.client = Client(url, client_id, client_secret, session=session, pool_maxsize=max_workers)
+    self._views = {}
+    self._lock = threading.Lock()
+
+  def for_customer(self, customer_id):
+    with self._lock:
+      view = self._views.get(customer_id)
+      if view is None:
+        view = self.client.for_customer(customer_id)
+        self._views[customer_id] = view
+      return view
+
+  def map(self, func, customer_ids, max_workers = None):
+    customer_ids = list(customer_ids)
+    logger.debug('Running {} across {} customers'.format(getattr(func, '__name__', func), len(customer_ids)))
+    results = run_concurrently(lambda customer_id: func(self.for_customer(customer_id)), customer_ids,
+                               max_workers or self.max_workers)
+    return dict(zip(customer_ids, results))
+
+  def call(self, method, customer_ids, *args, **kwargs):
+    return self.map(lambda client: getattr(client, method)(*args, **kwargs), customer_ids)
@@ -0,0 +1,38 @@
+import threading
+import time
+
+
+class TTLCache():
+  def __init__(self, ttl = None, clock = time.time):
+    self.ttl = ttl
+    self.clock = clock
+    self._entries = {}
+    self._lock = threading.Lock()
+
+  def get(self, key, default = None):
+    entry = self._entries.get(key)
+    if entry is None:
+      return default
+    value, expires = entry
+    if expires is not None and expires <= self.clock():
+      with self._lock:
+        if self._entries.get(key) is entry:
+          del self._entries[key]
+      return default
+    return value
+
+  def set(self, key, value):
+    expires = self.clock() + self.ttl if self.ttl is not None else None
+    with self._lock:
+      self._entries[key] = (value, expires)
+
+  def __contains__(self, key):
+    missing = object()
+    return self.get(key, missing) is not missing
+
+  def __len__(self):
+    return len(self._entries)
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
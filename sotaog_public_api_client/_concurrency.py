@@ -0,0 +1,7 @@
+def run_concurrently(func, items, max_workers):
+  items = list(items)
+  if max_workers <= 1 or len(items) <= 1:
+    return [func(item) for item in items]
+  from concurrent.futures import ThreadPoolExecutor
+  with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+    return list(executor.map(func, items))
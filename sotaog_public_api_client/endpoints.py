@@ -0,0 +1,172 @@
+import string
+
+
+class Endpoint():
+  __slots__ = ('verb', 'path', 'error', 'params', 'required', 'expected', 'idempotent', 'cacheable', 'returns',
+               'path_args')
+
+  def __init__(self, verb, path, error, params = (), required = (), expected = 200, idempotent = None,
+               cacheable = None, returns = 'json'):
+    self.verb = verb
+    self.path = path
+    self.error = error
+    self.params = tuple(params)
+    self.required = tuple(required)
+    self.expected = frozenset(expected if isinstance(expected, (tuple, list)) else (expected,))
+    self.idempotent = verb in ('GET', 'PUT') if idempotent is None else idempotent
+    self.cacheable = verb == 'GET' if cacheable is None else cacheable
+    self.returns = returns
+    self.path_args = tuple(field for _, field, _, _ in string.Formatter().parse(path) if field)
+
+  def format_path(self, args):
+    if not self.path_args:
+      return self.path
+    return self.path.format(**args)
+
+  def format_params(self, args):
+    params = {}
+    for name in self.required:
+      params[name] = args.get(name)
+    for name in self.params:
+      value = args.get(name)
+      if value:
+        params[name] = value
+    return params
+
+  def decode(self, result, object_pairs_hook = None):
+    if self.returns == 'json':
+      if object_pairs_hook is not None:
+        return result.json(object_pairs_hook=object_pairs_hook)
+      return result.json()
+    if self.returns == 'content':
+      return result.content
+    return None
+
+
+ENDPOINTS = {
+    'get_alarm_services': Endpoint('GET', '/v1/alarm-services', 'Unable to retrieve alarm services'),
+    'get_alarm_service': Endpoint('GET', '/v1/alarm-services/{alarm_service_id}',
+                                  'Unable to retrieve alarm service {alarm_service_id}'),
+    'get_alarms': Endpoint('GET', '/v1/alarms', 'Unable to retrieve alarms'),
+    'get_custom_alarms': Endpoint('GET', '/v1/custom-alarms', 'Unable to retrieve alarms'),
+    'get_custom_alarm': Endpoint('GET', '/v1/custom-alarms/{alarms_id}', 'Unable to retrieve alarms'),
+    'get_alarm_incidents': Endpoint('GET', '/v1/custom-alarms-incidents', 'Unable to retrieve alarms',
+                                    required=('alarm_id', 'well_id', 'alarm_status'), cacheable=False),
+    'post_custom_alarm_incidents': Endpoint('PUT', '/v1/custom-alarms-incidents', 'Unable to create Alarm Incidents',
+                                            expected=201),
+    'get_alarm': Endpoint('GET', '/v1/alarms/{asset_id}', 'Unable to retrieve alarms for {asset_id}'),
+    'get_alarm_datatype': Endpoint('GET', '/v1/alarms/{asset_id}/{datatype}', 'Unable to retrieve alarms for {asset_id}'),
+    'put_alarm': Endpoint('PUT', '/v1/alarms/{asset_id}/{datatype}', 'Unable to create alarm', expected=201,
+                          returns=None),
+
+    'get_facilities': Endpoint('GET', '/v1/facilities', 'Unable to retrieve facilities'),
+    'get_facility': Endpoint('GET', '/v1/facilities/{facility_id}', 'Unable to retrieve facility {facility_id}'),
+    'get_facility_config': Endpoint('GET', '/v1/facilities/{facility_id}/config', 'Unable to retrieve config'),
+    'put_facility_config': Endpoint('PUT', '/v1/facilities/{facility_id}/config', 'Unable to put facility config',
+                                    expected=201, returns=None),
+    'put_facility_sales': Endpoint('PUT', '/v1/facilities/sales/{facility_id}/{month}', 'Unable to put sales',
+                                   expected=(200, 201), returns=None),
+    'list_monthly_oil_report': Endpoint('GET', '/v1/facilities/report/oil', 'Unable to retrieve oil report list',
+                                        params=('facility_ids', 'start_month', 'end_month')),
+
+    'get_asset': Endpoint('GET', '/v1/{type}/{asset_id}', 'Unable to retrieve asset {asset_id} of type {type}'),
+    'get_assets': Endpoint('GET', '/v1/{type}', 'Unable to retrieve assets of type {type}'),
+    'get_asset_type': Endpoint('GET', '/v1/asset-types/{asset_type_id}', 'Unable to retrieve asset {asset_type_id}'),
+    'get_asset_types': Endpoint('GET', '/v1/asset-types', 'Unable to get asset types'),
+    'get_strapping_table': Endpoint('GET', '/v1/{type}/{asset_id}/strapping',
+                                    'Unable to retrieve strapping table for asset {asset_id} of type {type}',
+                                    returns='content'),
+    'get_compressors': Endpoint('GET', '/v1/compressors', 'Unable to get compressors'),
+    'put_compressor_downtime': Endpoint('PUT', '/v1/compressors/downtime', 'Unable to create compressor downtime',
+                                        expected=201, returns=None),
+    'get_customers': Endpoint('GET', '/v1/customers', 'Unable to get customers'),
+    'get_customer': Endpoint('GET', '/v1/customers/{customer_id}', 'Unable to get customer {customer_id}'),
+    'get_swd_networks': Endpoint('GET', '/v1/swd-networks', 'Unable to retrieve SWD networks'),
+
+    'get_datatypes': Endpoint('GET', '/v1/datatypes', 'Unable to get datatypes', params=('group_by',)),
+    'get_datatype': Endpoint('GET', '/v1/datatypes/{datatype_id}', 'Unable to get datatype {datatype_id}',
+                             required=('group_by',)),
+    'get_datapoints': Endpoint('POST', '/v1/datapoints', 'Unable to get datapoints', idempotent=True),
+    'get_asset_datapoints': Endpoint('GET', '/v1/datapoints/{asset_id}', 'Unable to get datapoints',
+                                     params=('datatypes', 'start_ts', 'end_ts', 'sort', 'limit')),
+    'post_datapoints': Endpoint('POST', '/v1/datapoints/{asset_id}', 'Unable to post datapoints', expected=202,
+                                returns=None),
+
+    'get_truck_tickets': Endpoint('GET', '/v1/truck-tickets', 'Unable to retrieve truck tickets',
+                                  params=('start_ts', 'end_ts', 'type', 'facility')),
+    'get_auto_truck_tickets': Endpoint('GET', '/v1/auto-truck-tickets', 'Unable to retrieve truck tickets',
+                                       params=('start_ts', 'end_ts', 'type', 'facility')),
+    'post_truck_ticket': Endpoint('POST', '/v1/truck-tickets', 'Unable to create truck ticket', expected=201),
+    'post_auto_truck_ticket': Endpoint('POST', '/v1/auto-truck-tickets', 'Unable to create auto truck ticket',
+                                       expected=201),
+    'put_truck_ticket': Endpoint('POST', '/v1/truck-tickets/{truck_ticket_id}/{timestamp}',
+                                 'Unable to update truck-ticket', expected=(200, 201), idempotent=True, returns=None),
+    'put_truck_ticket_image': Endpoint('PUT', '/v1/truck-tickets/{truck_ticket_id}/{timestamp}/image',
+                                       'Unable to create truck ticket image', expected=204, returns=None),
+
+    'batch_put_well_production': Endpoint('PUT', '/v1/wells/production', 'Unable to batch create well production',
+                                          expected=201, returns=None),
+    'put_well_production': Endpoint('PUT', '/v1/wells/production/{well_id}/{date}', 'Unable to create well production',
+                                    expected=201, returns=None),
+    'list_well_production': Endpoint('GET', '/v1/wells/production', 'Unable to retrieve well production',
+                                     params=('well_ids', 'facility_ids', 'start_date', 'end_date')),
+    'list_well_optimised_production': Endpoint('GET', '/v1/wells/optimized-production',
+                                               'Unable to retrieve well optimised production',
+                                               params=('well_ids', 'facility_ids')),
+    'get_today_predicted': Endpoint('GET', '/v1/wells/production/today-prediction',
+                                    'Unable to retrieve today predicted', params=('well_ids', 'refresh'),
+                                    cacheable=False),
+    'list_well_daily_warehouse': Endpoint('GET', '/v1/wells/warehouse', 'Unable to retrieve well warehouse',
+                                          params=('well_ids', 'facility_ids', 'start_date', 'end_date')),
+    'list_well_status': Endpoint('GET', '/v1/wells/status/latest', 'Unable to retrieve well status',
+                                 params=('well_ids',), cacheable=False),
+    'list_well_sales': Endpoint('GET', '/v1/wells/sales/daily', 'Unable to retrieve well sales',
+                                params=('well_ids', 'start_date', 'end_date')),
+    'get_well_config': Endpoint('GET', '/v1/wells/{well_id}/config', 'Unable to retrieve config'),
+    'put_well_config': Endpoint('PUT', '/v1/wells/{well_id}/config', 'Unable to put well config', expected=201,
+                                returns=None),
+    'get_well_datapoint': Endpoint('GET', '/v1/wells/datapoint', 'Unable to retrieve well datapoint',
+                                   params=('well_ids', 'datapoints', 'timestamps')),
+    'batch_put_well_datapoint': Endpoint('PUT', '/v1/wells/datapoint', 'Unable to batch create well datapoint',
+                                         expected=201, returns=None),
+    'list_report_tank_gauge': Endpoint('GET', '/v1/wells/report/tank-gauge', 'Unable to retrieve tank gauge report list',
+                                       params=('well_ids', 'start_date', 'end_date')),
+
+    'get_well_type_curve': Endpoint('GET', '/v1/wells/{well_id}/type-curve', 'Unable to retrieve type curve'),
+    'batch_well_type_curve': Endpoint('PUT', '/v1/wells/{well_id}/type-curve', 'Unable to create well type curves',
+                                      expected=201, returns=None),
+    'get_type_curves': Endpoint('GET', '/v1/type-curves', 'Unable to retrieve type curves',
+                                params=('well_ids', 'facility_ids', 'lease_ids', 'start_date', 'end_date'),
+                                required=('combine',)),
+    'get_well_tpr_ipr_curve': Endpoint('GET', '/v1/wells/{well_id}/tpr-ipr-curve', 'Unable to retrieve IPR/TPR curve',
+                                       params=('refresh',)),
+    'get_res_mgmt_plots': Endpoint('GET', '/v1/wells/{well_id}/res_mgmt_plots',
+                                   'Unable to retrieve resevior mgmt plot data', params=('refresh',)),
+    'get_flowing_bottom_hole_pressure': Endpoint('GET', '/v1/wells/{well_id}/flowing-bottom-hole-pressure',
+                                                 'Unable to retrieve flowing bottom hole pressure history',
+                                                 params=('refresh',)),
+    'get_critical_rate_analysis': Endpoint('GET', '/v1/wells/{well_id}/critical-rate-analysis',
+                                           'Unable to retrieve Critical Rate Data',
+                                           params=('refresh', 'start_date', 'end_date')),
+
+    'get_oil_gas_price': Endpoint('GET', '/v1/financials/oil-gas-price', 'Unable to retrieve Oil Gas prices',
+                                  params=('start_date', 'end_date')),
+    'get_financials_categories': Endpoint('GET', '/v1/financials-categories',
+                                          'Unable to retrieve financials categories'),
+    'post_financials_category': Endpoint('POST', '/v1/financials-categories', 'Unable to create financials categories',
+                                         expected=201),
+    'post_financials_category_price': Endpoint('POST', '/v1/financials-categories-price',
+                                               'Unable to create financials categories price', expected=201),
+    'get_well_financials_category_prices': Endpoint('GET', '/v1/financials-categories-well-price',
+                                                    'Unable to retrieve financials categories', params=('well_ids',),
+                                                    required=('date',)),
+    'put_financials': Endpoint('PUT', '/v1/financials/{type}/{type_id}/{month}', 'Unable to put financials',
+                               expected=(200, 201), returns=None),
+    'get_financials': Endpoint('GET', '/v1/financials/{asset_type}', 'Unable to retrieve type financials',
+                               params=('well_ids', 'facility_ids', 'lease_ids', 'start_date', 'end_date', 'start_month',
+                                       'end_month'),
+                               required=('type',)),
+
+    'get_custom_reports': Endpoint('GET', '/v1/custom_reports', 'Unable to retrieve custom reports list'),
+    'send_sms': Endpoint('POST', '/v1/sms', 'Unable to send sms'),
+}
@@ -0,0 +1,204 @@
+import calendar
+import logging
+import time
+
+from ._concurrency import run_concurrently
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+FIELDS = {
+    'well': 'well_id',
+    'facility': 'facility_id',
+    'date': 'date',
+    'oil': 'oil',
+    'gas': 'gas',
+    'water': 'water',
+    'price': 'price',
+    'unit': 'unit',
+    'cost': 'cost',
+}
+VOLUMES = ('oil', 'gas', 'water')
+SOLD = ('oil', 'gas')
+KEYS = ('well', 'facility', 'month')
+VALUES = ('revenue', 'cost', 'net')
+
+
+def _numpy():
+  try:
+    import numpy
+  except ImportError:
+    raise ImportError('numpy is required for financials, install sotaog_public_api_client[financials]')
+  return numpy
+
+
+def _months(start_month, end_month):
+  year, month = [int(part) for part in start_month.split('-')[:2]]
+  months = []
+  while '{:04d}-{:02d}'.format(year, month) <= end_month[:7]:
+    months.append('{:04d}-{:02d}'.format(year, month))
+    year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+  return months
+
+
+def _month_range(month):
+  year, number = [int(part) for part in month.split('-')]
+  return '{}-01'.format(month), '{}-{:02d}'.format(month, calendar.monthrange(year, number)[1])
+
+
+def _rows(data, well_field):
+  # Accept either a list of rows or rows grouped by well ID ({well_id: row or [rows]})
+  if not isinstance(data, dict):
+    return data or []
+  rows = []
+  for well_id, values in data.items():
+    for value in values if isinstance(values, list) else [values]:
+      row = dict(value)
+      row.setdefault(well_field, well_id)
+      rows.append(row)
+  return rows
+
+
+class Financials():
+  def __init__(self, columns):
+    self.columns = columns
+
+  def __len__(self):
+    return len(self.columns['net'])
+
+  @classmethod
+  def concat(cls, frames):
+    np = _numpy()
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+      return cls({name: np.array([], dtype=object if name in KEYS else float) for name in KEYS + VALUES})
+    return cls({name: np.concatenate([frame.columns[name] for frame in frames]) for name in frames[0].columns})
+
+  def group_by(self, *keys):
+    np = _numpy()
+    if not len(self):
+      return Financials({name: self.columns[name] for name in keys + VALUES})
+    combined = np.zeros(len(self), dtype=np.int64)
+    for key in keys:
+      uniques, codes = np.unique(self.columns[key].astype(str), return_inverse=True)
+      combined = combined * len(uniques) + codes
+    groups, first, inverse = np.unique(combined, return_index=True, return_inverse=True)
+    columns = {key: self.columns[key][first] for key in keys}
+    for name in VALUES:
+      columns[name] = np.bincount(inverse, weights=self.columns[name], minlength=len(groups))
+    return Financials(columns)
+
+  def to_rows(self):
+    names = list(self.columns)
+    return [dict(zip(names, values)) for values in zip(*[self.columns[name].tolist() for name in names])]
+
+
+# Revenue is sold oil/gas volume times the daily price. Cost is produced volume times the well's per-unit
+# category prices, plus per-producing-day cost for categories without a volume unit, plus recorded costs.
+class FinancialsEngine():
+  def __init__(self, client, max_workers = 5, fields = None):
+    self.client = client
+    self.max_workers = max_workers
+    self.fields = dict(FIELDS, **(fields or {}))
+    self._cache = {}
+
+  def compute(self, start_month, end_month, well_ids = None, facility_ids = None):
+    scope = (tuple(well_ids or ()), tuple(facility_ids or ()))
+    months = _months(start_month, end_month)
+    missing = [month for month in months if (month, scope) not in self._cache]
+    logger.debug('Computing financials for %s months (%s cached)', len(months), len(months) - len(missing))
+    tasks = [(month, name) for month in missing for name in ('production', 'sales', 'prices', 'categories', 'recorded')]
+    inputs = run_concurrently(lambda task: self._fetch(task[0], task[1], well_ids, facility_ids), tasks,
+                              self.max_workers)
+    fetched = {}
+    for (month, name), data in zip(tasks, inputs):
+      fetched.setdefault(month, {})[name] = data
+    current_month = time.strftime('%Y-%m')
+    frames = {}
+    for month in missing:
+      frames[month] = self._compute_month(month, **fetched[month])
+      if month < current_month:
+        self._cache[(month, scope)] = frames[month]
+    return Financials.concat([frames[month] if month in frames else self._cache[(month, scope)] for month in months])
+
+  def _fetch(self, month, name, well_ids, facility_ids):
+    start_date, end_date = _month_range(month)
+    if name == 'production':
+      return self.client.list_well_production(well_ids=well_ids, facility_ids=facility_ids, start_date=start_date,
+                                              end_date=end_date)
+    if name == 'sales':
+      return self.client.list_well_sales(well_ids=well_ids, start_date=start_date, end_date=end_date)
+    if name == 'prices':
+      return self.client.get_oil_gas_price(start_date=start_date, end_date=end_date)
+    if name == 'categories':
+      return self.client.get_well_financials_category_prices(start_date, well_ids=well_ids)
+    return self.client.get_financials(well_ids=well_ids, facility_ids=facility_ids, start_month=month, end_month=month)
+
+  def _columns(self, rows, names):
+    np = _numpy()
+    columns = {}
+    for name in names:
+      field = self.fields[name]
+      if name in VOLUMES or name in ('price', 'cost'):
+        columns[name] = np.fromiter((row.get(field) or 0.0 for row in rows), dtype=float, count=len(rows))
+      else:
+        columns[name] = np.array([row.get(field) for row in rows], dtype=object)
+    return columns
+
+  def _compute_month(self, month, production, sales, prices, categories, recorded):
+    np = _numpy()
+    well_field = self.fields['well']
+    production = self._columns(_rows(production, well_field), ('well', 'facility', 'date') + VOLUMES)
+    sales = self._columns(_rows(sales, well_field), ('well', 'facility', 'date') + SOLD)
+    prices = self._columns(_rows(prices, well_field), ('date',) + SOLD)
+    categories = self._columns(_rows(categories, well_field), ('well', 'unit', 'price'))
+    recorded = self._columns(_rows(recorded, well_field), ('well', 'cost'))
+
+    wells = np.unique(np.concatenate([production['well'], sales['well'], categories['well'],
+                                      recorded['well']]).astype(str))
+    count = len(wells)
+
+    def codes(column):
+      return np.searchsorted(wells, column.astype(str))
+
+    order = np.argsort(prices['date'].astype(str))
+    price_dates = prices['date'].astype(str)[order]
+
+    def price_at(dates, volume):
+      if not len(price_dates):
+        return np.zeros(len(dates))
+      dates = dates.astype(str)
+      positions = np.minimum(np.searchsorted(price_dates, dates), len(price_dates) - 1)
+      return np.where(price_dates[positions] == dates, prices[volume][order][positions], 0.0)
+
+    sales_codes = codes(sales['well'])
+    revenue = np.zeros(len(sales_codes))
+    for volume in SOLD:
+      revenue += sales[volume] * price_at(sales['date'], volume)
+
+    category_codes = codes(categories['well'])
+    units = categories['unit'].astype(str)
+    production_codes = codes(production['well'])
+    cost = np.zeros(len(production_codes))
+    for volume in VOLUMES:
+      rates = np.bincount(category_codes, weights=np.where(units == volume, categories['price'], 0.0), minlength=count)
+      cost += production[volume] * rates[production_codes]
+    fixed = np.bincount(category_codes, weights=np.where(np.isin(units, VOLUMES), 0.0, categories['price']),
+                        minlength=count)
+
+    revenue_by_well = np.bincount(sales_codes, weights=revenue, minlength=count)
+    cost_by_well = (np.bincount(production_codes, weights=cost, minlength=count)
+                    + fixed * np.bincount(production_codes, minlength=count)
+                    + np.bincount(codes(recorded['well']), weights=recorded['cost'], minlength=count))
+    # Production rows take precedence; wells found in neither production nor sales keep a None facility
+    facilities = np.full(count, None, dtype=object)
+    has_facility = sales['facility'] != None  # noqa: E711
+    facilities[sales_codes[has_facility]] = sales['facility'][has_facility]
+    facilities[production_codes] = production['facility']
+    return Financials({
+        'well': wells.astype(object),
+        'facility': facilities,
+        'month': np.full(count, month, dtype=object),
+        'revenue': revenue_by_well,
+        'cost': cost_by_well,
+        'net': revenue_by_well - cost_by_well,
+    })
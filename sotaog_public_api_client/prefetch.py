@@ -0,0 +1,58 @@
+import logging
+
+from ._cache import TTLCache
+from ._concurrency import run_concurrently
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+ANALYSES = {
+    'tpr_ipr_curve': 'get_well_tpr_ipr_curve',
+    'res_mgmt_plots': 'get_res_mgmt_plots',
+    'flowing_bottom_hole_pressure': 'get_flowing_bottom_hole_pressure',
+    'critical_rate_analysis': 'get_critical_rate_analysis',
+}
+
+
+class PrefetchPlanner():
+  def __init__(self, client, max_workers = 4, ttl = 900, analyses = None):
+    self.client = client
+    self.max_workers = max_workers
+    self.analyses = list(analyses or ANALYSES)
+    self.cache = TTLCache(ttl)
+
+  def plan(self, well_ids):
+    return [(analysis, well_id) for well_id in well_ids for analysis in self.analyses
+            if (analysis, well_id) not in self.cache]
+
+  def warm(self, well_ids, refresh = True):
+    well_ids = list(well_ids)
+    tasks = self.plan(well_ids)
+    logger.info('Prefetching %s analyses for %s wells', len(tasks), len(well_ids))
+
+    def fetch(task):
+      try:
+        self._fetch(task[0], task[1], refresh)
+      except Exception as e:
+        logger.warning('Unable to prefetch %s for %s: %s', task[0], task[1], e)
+        return e
+
+    failures = run_concurrently(fetch, tasks, self.max_workers)
+    return {task: failure for task, failure in zip(tasks, failures) if failure is not None}
+
+  def _fetch(self, analysis, well_id, refresh):
+    data = getattr(self.client, ANALYSES[analysis])(well_id, refresh)
+    self.cache.set((analysis, well_id), data)
+    return data
+
+  def get(self, analysis, well_id, fetch = True):
+    missing = object()
+    data = self.cache.get((analysis, well_id), missing)
+    if data is not missing:
+      return data
+    if not fetch:
+      raise KeyError((analysis, well_id))
+    return self._fetch(analysis, well_id, None)
+
+  def report(self, well_ids, fetch = True):
+    return {well_id: {analysis: self.get(analysis, well_id, fetch) for analysis in self.analyses}
+            for well_id in well_ids}
@@ -0,0 +1,155 @@
+import array
+import keyword
+import re
+import sys
+import threading
+
+MAX_FIELDS = 64
+MAX_RECORD_TYPES = 1024
+MAX_INTERN_LENGTH = 64
+MAX_INTERNED = 100000
+
+STRING_TYPES = (str, type(u''))
+IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+
+_record_types = {}
+_lock = threading.Lock()
+
+try:
+  _intern_string = sys.intern
+except AttributeError:
+  # Python 2's intern() rejects unicode, so equal strings are shared through a bounded table instead
+  _interned = {}
+
+  def _intern_string(value):
+    if len(_interned) >= MAX_INTERNED:
+      _interned.clear()
+    return _interned.setdefault(value, value)
+
+
+class Record(object):
+  __slots__ = ()
+  _fields = ()
+
+  def __init__(self, *values):
+    for name, value in zip(self._fields, values):
+      setattr(self, name, value)
+
+  def __getitem__(self, key):
+    try:
+      return getattr(self, key)
+    except (AttributeError, TypeError):
+      raise KeyError(key)
+
+  def __contains__(self, key):
+    return key in self._fields
+
+  def __eq__(self, other):
+    if isinstance(other, Record):
+      return self._fields == other._fields and self._values() == other._values()
+    if isinstance(other, dict):
+      return self._asdict() == other
+    return NotImplemented
+
+  def __ne__(self, other):
+    result = self.__eq__(other)
+    return result if result is NotImplemented else not result
+
+  __hash__ = None
+
+  def __repr__(self):
+    return '{}({})'.format(type(self).__name__, ', '.join('{}={!r}'.format(name, getattr(self, name))
+                                                        for name in self._fields))
+
+  def _values(self):
+    return tuple(getattr(self, name) for name in self._fields)
+
+  def _asdict(self):
+    return dict(zip(self._fields, self._values()))
+
+  def get(self, key, default = None):
+    return getattr(self, key, default) if key in self._fields else default
+
+  def keys(self):
+    return self._fields
+
+
+# A slot named after a Record method (get, keys, ...) would hide it, so such objects stay dicts
+RESERVED_FIELDS = frozenset(dir(Record))
+
+
+def _valid_fields(fields):
+  return (len(fields) <= MAX_FIELDS and len(set(fields)) == len(fields)
+          and all(isinstance(field, STRING_TYPES) and IDENTIFIER.match(field) and not keyword.iskeyword(field)
+                  and not field.startswith('_') and field not in RESERVED_FIELDS for field in fields))
+
+
+def record_type(fields):
+  fields = tuple(fields)
+  cls = _record_types.get(fields)
+  if cls is None:
+    with _lock:
+      cls = _record_types.get(fields)
+      if cls is None and len(_record_types) < MAX_RECORD_TYPES and _valid_fields(fields):
+        fields = tuple(_intern_string(field) for field in fields)
+        cls = type('Record', (Record,), {'__slots__': fields, '_fields': fields})
+        _record_types[fields] = cls
+  return cls
+
+
+def _intern(value):
+  if isinstance(value, STRING_TYPES) and len(value) <= MAX_INTERN_LENGTH:
+    return _intern_string(value)
+  return value
+
+
+def object_pairs_hook(pairs):
+  cls = record_type(key for key, _ in pairs)
+  if cls is None:
+    return dict((_intern(key), _intern(value)) for key, value in pairs)
+  return cls(*[_intern(value) for _, value in pairs])
+
+
+class Columns():
+  def __init__(self, columns, length):
+    self.columns = columns
+    self.length = length
+
+  def __getitem__(self, name):
+    return self.columns[name]
+
+  def __contains__(self, name):
+    return name in self.columns
+
+  def __len__(self):
+    return self.length
+
+  def keys(self):
+    return self.columns.keys()
+
+  def row(self, index):
+    return dict((name, column[index]) for name, column in self.columns.items())
+
+
+def _numeric(value):
+  if isinstance(value, int) and not isinstance(value, bool):
+    return -2 ** 53 <= value <= 2 ** 53
+  return value is None or isinstance(value, float)
+
+
+def to_columns(rows):
+  names = []
+  seen = set()
+  for row in rows:
+    keys = tuple(row.keys())
+    if keys not in seen:
+      seen.add(keys)
+      names.extend(name for name in keys if name not in names)
+  columns = {}
+  for name in names:
+    values = [row.get(name) for row in rows]
+    if all(_numeric(value) for value in values) and any(value is not None for value in values):
+      columns[name] = array.array('d', (float('nan') if value is None else value for value in values))
+    else:
+      columns[name] = [_intern(value) for value in values]
+  return Columns(columns, len(rows))
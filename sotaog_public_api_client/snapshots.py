@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+
+class Snapshot(object):
+  __slots__ = ('data', 'index', 'timestamp')
+
+  def __init__(self, data, index, timestamp):
+    self.data = data
+    self.index = index
+    self.timestamp = timestamp
+
+  def subset(self, well_ids):
+    if isinstance(self.data, dict):
+      return {well_id: self.index[well_id] for well_id in well_ids if well_id in self.index}
+    return [self.index[well_id] for well_id in well_ids if well_id in self.index]
+
+
+class SnapshotCache():
+  def __init__(self, client, interval = 30, on_change = None, key = 'well_id'):
+    self.interval = interval
+    self.on_change = on_change
+    self.key = key
+    self._sources = {
+        'well_status': client.list_well_status,
+        'today_predicted': client.get_today_predicted,
+    }
+    self._snapshots = {}
+    self._stop = threading.Event()
+    self._thread = None
+
+  def start(self):
+    if self._thread is None:
+      self._stop.clear()
+      self._thread = threading.Thread(target=self._run, name='sotaog-snapshot-cache')
+      self._thread.daemon = True
+      self._thread.start()
+    return self
+
+  def stop(self):
+    self._stop.set()
+    if self._thread is not None:
+      self._thread.join()
+      self._thread = None
+
+  def _run(self):
+    while not self._stop.is_set():
+      self.refresh()
+      self._stop.wait(self.interval)
+
+  def refresh(self):
+    for name, fetch in self._sources.items():
+      try:
+        data = fetch()
+      except Exception:
+        logger.exception('Unable to refresh %s snapshot', name)
+        continue
+      snapshot = Snapshot(data, self._index(data), time.time())
+      previous = self._snapshots.get(name)
+      self._snapshots[name] = snapshot
+      if self.on_change is not None:
+        changes = _diff(previous.index if previous else {}, snapshot.index)
+        if changes:
+          try:
+            self.on_change(name, changes)
+          except Exception:
+            logger.exception('Snapshot on_change callback failed for %s', name)
+
+  def _index(self, data):
+    if isinstance(data, dict):
+      return data
+    return {row[self.key]: row for row in data or [] if isinstance(row, dict) and self.key in row}
+
+  def snapshot(self, name):
+    return self._snapshots.get(name)
+
+  def get(self, name, well_ids = None):
+    snapshot = self._snapshots.get(name)
+    if snapshot is None:
+      return None
+    if well_ids is None:
+      return snapshot.data
+    return snapshot.subset(well_ids)
+
+  def well_status(self, well_ids = None):
+    return self.get('well_status', well_ids)
+
+  def today_predicted(self, well_ids = None):
+    return self.get('today_predicted', well_ids)
+
+
+def _diff(previous, current):
+  changes = {well_id: row for well_id, row in current.items() if previous.get(well_id) != row}
+  for well_id in previous:
+    if well_id not in current:
+      changes[well_id] = None
+  return changes
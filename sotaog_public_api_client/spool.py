@@ -0,0 +1,252 @@
+import collections
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+# os.replace is Python 3 only; os.rename also overwrites atomically on POSIX
+_replace = getattr(os, 'replace', os.rename)
+
+
+def _asset_lane(method, args):
+  return ('asset', args[0])
+
+
+def _method_lane(method, args):
+  return (method,)
+
+
+LANES = {
+    'post_datapoints': _asset_lane,
+    'put_alarm': _asset_lane,
+}
+# Client errors that may succeed on a later attempt; any other 4xx is permanent
+RETRYABLE_STATUS_CODES = (408, 429)
+# Writes whose payload argument (by position) is a list can be concatenated into one request
+MERGES = {
+    'post_datapoints': 1,
+    'batch_put_well_datapoint': 0,
+}
+
+
+def _mergeable(entry, method):
+  return entry['method'] == method and isinstance(entry['args'][MERGES[method]], list)
+
+
+def _merge(entries):
+  index = MERGES[entries[0]['method']]
+  args = list(entries[0]['args'])
+  args[index] = [item for entry in entries for item in entry['args'][index]]
+  return args
+
+
+class WriteQueue():
+  # Replaying a backlog (writes spooled before a restart, or more than backlog pending after an outage) is capped
+  # at max_rate requests per second, and every spool record is fsynced; pass max_rate=None or fsync=False to opt
+  # out. Writes rejected with a 4xx, or still failing
+  # after max_attempts, are moved to dead_letter_path (default path + '.dead') so they cannot block their lane.
+  def __init__(self, client, path, batch_size = 100, max_rate = 10.0, retry_interval = 1.0, max_retry_interval = 60.0,
+               max_attempts = 20, fsync = True, dead_letter_path = None, backlog = 1000):
+    self.client = client
+    self.path = path
+    self.batch_size = batch_size
+    self.max_rate = max_rate
+    self.retry_interval = retry_interval
+    self.max_retry_interval = max_retry_interval
+    self.max_attempts = max_attempts
+    self.fsync = fsync
+    self.dead_letter_path = dead_letter_path or path + '.dead'
+    self.backlog = backlog
+    self._lanes = collections.OrderedDict()
+    self._retries = {}
+    self._unmerged = set()
+    self._condition = threading.Condition()
+    self._log_lock = threading.Lock()
+    self._seq = 0
+    self._pending = 0
+    self._last_send = 0.0
+    self._closed = False
+    self._load()
+    self._replay_seq = self._seq
+    self._log = open(self.path, 'a')
+    self._thread = threading.Thread(target=self._run, name='sotaog-write-queue')
+    self._thread.daemon = True
+    self._thread.start()
+
+  def post_datapoints(self, asset_id, datapoints):
+    return self.submit('post_datapoints', asset_id, datapoints)
+
+  def put_alarm(self, asset_id, datatype, alarm):
+    return self.submit('put_alarm', asset_id, datatype, alarm)
+
+  def put_compressor_downtime(self, compressor):
+    return self.submit('put_compressor_downtime', compressor)
+
+  def batch_put_well_datapoint(self, datapoint):
+    return self.submit('batch_put_well_datapoint', datapoint)
+
+  def submit(self, method, *args):
+    with self._condition:
+      if self._closed:
+        raise ValueError('Write queue is closed')
+      self._seq += 1
+      entry = {'seq': self._seq, 'method': method, 'args': list(args)}
+      self._append(entry)
+      self._enqueue(entry)
+      self._condition.notify()
+      return entry['seq']
+
+  def __len__(self):
+    return self._pending
+
+  def flush(self, timeout = None):
+    deadline = time.time() + timeout if timeout is not None else None
+    with self._condition:
+      while self._pending:
+        remaining = deadline - time.time() if deadline is not None else None
+        if remaining is not None and remaining <= 0:
+          return False
+        self._condition.wait(remaining)
+      return True
+
+  def close(self, timeout = None):
+    if timeout:
+      self.flush(timeout)
+    with self._condition:
+      self._closed = True
+      self._condition.notify_all()
+    self._thread.join()
+    self._log.close()
+
+  def _load(self):
+    if not os.path.exists(self.path):
+      return
+    entries = {}
+    with open(self.path) as log:
+      for line in log:
+        try:
+          record = json.loads(line)
+        except ValueError:
+          logger.warning('Skipping unreadable spool record in %s', self.path)
+          continue
+        if 'ack' in record:
+          acked = record['ack'] if isinstance(record['ack'], list) else [record['ack']]
+          for seq in acked:
+            entries.pop(seq, None)
+          self._seq = max([self._seq] + acked)
+        else:
+          entries[record['seq']] = record
+          self._seq = max(self._seq, record['seq'])
+    with open(self.path + '.tmp', 'w') as log:
+      for seq in sorted(entries):
+        log.write(json.dumps(entries[seq]) + '\n')
+        self._enqueue(entries[seq])
+    _replace(self.path + '.tmp', self.path)
+    if entries:
+      logger.info('Replaying %s spooled writes from %s', len(entries), self.path)
+
+  def _append(self, record):
+    with self._log_lock:
+      self._log.write(json.dumps(record) + '\n')
+      self._log.flush()
+      if self.fsync:
+        os.fsync(self._log.fileno())
+
+  def _enqueue(self, entry):
+    lane = LANES.get(entry['method'], _method_lane)(entry['method'], entry['args'])
+    self._lanes.setdefault(lane, collections.deque()).append(entry)
+    self._pending += 1
+
+  def _next_batch(self, now):
+    for lane, entries in self._lanes.items():
+      if not entries or self._retries.get(lane, (0, 0))[1] > now:
+        continue
+      self._lanes[lane] = self._lanes.pop(lane)
+      head = entries[0]
+      batch = [head]
+      if head['method'] in MERGES and _mergeable(head, head['method']) and lane not in self._unmerged:
+        for entry in list(entries)[1:self.batch_size]:
+          if not _mergeable(entry, head['method']):
+            break
+          batch.append(entry)
+      return lane, batch
+    return None
+
+  def _wait_time(self, now):
+    retry_times = [self._retries[lane][1] for lane, entries in self._lanes.items() if entries and lane in self._retries]
+    return max(0.0, min(retry_times) - now) if retry_times else None
+
+  def _run(self):
+    while True:
+      with self._condition:
+        batch = self._next_batch(time.time())
+        while batch is None and not self._closed:
+          self._condition.wait(self._wait_time(time.time()))
+          batch = self._next_batch(time.time())
+        if self._closed:
+          return
+        lane, entries = batch
+        replaying = entries[0]['seq'] <= self._replay_seq or self._pending > self.backlog
+      if replaying:
+        self._throttle()
+      try:
+        self._send(entries)
+      except Exception as e:
+        self._failed(lane, entries, e)
+      else:
+        self._done(lane, entries)
+
+  def _throttle(self):
+    if self.max_rate:
+      delay = self._last_send + 1.0 / self.max_rate - time.time()
+      if delay > 0:
+        time.sleep(delay)
+    self._last_send = time.time()
+
+  def _send(self, entries):
+    method = entries[0]['method']
+    args = _merge(entries) if len(entries) > 1 else entries[0]['args']
+    getattr(self.client, method)(*args)
+
+  def _done(self, lane, entries):
+    # A single ack line (and fsync) per batch, written without holding the lock submit() waits on
+    self._append({'ack': [entry['seq'] for entry in entries]})
+    with self._condition:
+      for entry in entries:
+        self._lanes[lane].popleft()
+      if not self._lanes[lane]:
+        del self._lanes[lane]
+        self._unmerged.discard(lane)
+      self._pending -= len(entries)
+      self._retries.pop(lane, None)
+      if not self._pending:
+        with self._log_lock:
+          self._log.close()
+          self._log = open(self.path, 'w')
+      self._condition.notify_all()
+
+  def _failed(self, lane, entries, error):
+    status_code = getattr(error, 'status_code', None)
+    permanent = status_code is not None and 400 <= status_code < 500 and status_code not in RETRYABLE_STATUS_CODES
+    with self._condition:
+      attempts = self._retries.get(lane, (0, 0))[0] + 1
+      if permanent and len(entries) > 1:
+        # One bad write rejects the whole merged request, so resend the lane one write at a time to find it
+        logger.warning('Merged %s write(s) for %s rejected, resending individually: %s', len(entries), lane, error)
+        self._unmerged.add(lane)
+        return
+      if not permanent and (self.max_attempts is None or attempts < self.max_attempts):
+        delay = min(self.max_retry_interval, self.retry_interval * 2 ** (attempts - 1))
+        logger.warning('Unable to send %s write(s) for %s, retrying in %ss: %s', len(entries), lane, delay, error)
+        self._retries[lane] = (attempts, time.time() + delay)
+        return
+      self._unmerged.discard(lane)
+    logger.error('Moving %s %s write(s) to %s after %s attempt(s): %s', len(entries), entries[0]['method'],
+                 self.dead_letter_path, attempts, error)
+    with open(self.dead_letter_path, 'a') as dead_letters:
+      for entry in entries:
+        dead_letters.write(json.dumps(dict(entry, error=str(error), status_code=status_code)) + '\n')
+    self._done(lane, entries)
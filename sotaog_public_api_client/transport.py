@@ -0,0 +1,146 @@
+import collections
+import datetime
+import hashlib
+import json
+import logging
+import threading
+import time
+import zipfile
+
+from . import Client_Exception
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+INDEX_NAME = 'index.json'
+KEY_HEADERS = ('x-sotaog-customer-id', 'content-type')
+REDACTED_FIELDS = ('access_token', 'refresh_token', 'id_token')
+REDACTED_TOKEN = 'recorded-token'
+
+
+def request_key(method, url, params = None, json = None, data = None, headers = None, **kwargs):
+  body = b''
+  if json is not None:
+    body = _dumps(json).encode('utf-8')
+  elif isinstance(data, bytes):
+    body = data
+  elif data is not None:
+    body = _dumps(data).encode('utf-8')
+  headers = dict((name.lower(), value) for name, value in (headers or {}).items())
+  parts = [method.upper(), url, _dumps(params or {}), _dumps([headers.get(name) for name in KEY_HEADERS]),
+           hashlib.sha1(body).hexdigest()]
+  return ' '.join(parts)
+
+
+def _redact(url, content):
+  # Login responses carry live bearer tokens; archives only ever hold a placeholder
+  if not url.endswith('/v1/authenticate'):
+    return content
+  try:
+    body = json.loads(content.decode('utf-8'))
+  except ValueError:
+    return content
+  if isinstance(body, dict):
+    for field in REDACTED_FIELDS:
+      if field in body:
+        body[field] = REDACTED_TOKEN
+  return json.dumps(body).encode('utf-8')
+
+
+def _dumps(value):
+  return json.dumps(value, sort_keys=True, separators=(',', ':'), default=str)
+
+
+class RecordedResponse():
+  def __init__(self, status_code, content, headers = None, elapsed = 0.0, url = None):
+    self.status_code = status_code
+    self.content = content
+    self.headers = headers or {}
+    self.elapsed = datetime.timedelta(seconds=elapsed)
+    self.url = url
+
+  @property
+  def text(self):
+    return self.content.decode('utf-8')
+
+  def json(self, **kwargs):
+    return json.loads(self.text, **kwargs)
+
+
+class RecordingTransport():
+  def __init__(self, path, session = None):
+    self.path = path
+    self._session = session
+    self._entries = []
+    self._lock = threading.Lock()
+    self._archive = zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED)
+
+  @property
+  def session(self):
+    if self._session is None:
+      import requests
+      self._session = requests.Session()
+    return self._session
+
+  def request(self, method, url, **kwargs):
+    start = time.time()
+    result = self.session.request(method, url, **kwargs)
+    elapsed = time.time() - start
+    key = request_key(method, url, **kwargs)
+    with self._lock:
+      name = 'bodies/{}'.format(len(self._entries))
+      self._archive.writestr(name, _redact(url, result.content))
+      self._entries.append({
+          'key': key,
+          'status_code': result.status_code,
+          'headers': dict(getattr(result, 'headers', None) or {}),
+          'elapsed': elapsed,
+          'url': url,
+          'body': name,
+      })
+    return result
+
+  def close(self):
+    with self._lock:
+      if self._archive is not None:
+        self._archive.writestr(INDEX_NAME, json.dumps(self._entries))
+        self._archive.close()
+        self._archive = None
+        logger.debug('Recorded %s responses to %s', len(self._entries), self.path)
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
+
+
+class ReplayTransport():
+  def __init__(self, path, latency = 0.0):
+    self.path = path
+    self.latency = latency
+    self._archive = zipfile.ZipFile(path, 'r')
+    self._entries = collections.defaultdict(collections.deque)
+    for entry in json.loads(self._archive.read(INDEX_NAME).decode('utf-8')):
+      self._entries[entry['key']].append(entry)
+    self._lock = threading.Lock()
+
+  def request(self, method, url, **kwargs):
+    key = request_key(method, url, **kwargs)
+    with self._lock:
+      entries = self._entries.get(key)
+      if not entries:
+        raise Client_Exception('No recorded response for {} {}'.format(method, url))
+      entry = entries.popleft() if len(entries) > 1 else entries[0]
+      content = self._archive.read(entry['body'])
+    if self.latency:
+      time.sleep(entry['elapsed'] * self.latency)
+    return RecordedResponse(entry['status_code'], content, entry['headers'], entry['elapsed'], entry['url'])
+
+  def close(self):
+    self._archive.close()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc_info):
+    self.close()
@@ -0,0 +1,119 @@
+import array
+import logging
+
+from ._cache import TTLCache
+from ._concurrency import run_concurrently
+
+logger = logging.getLogger('sotaog_public_api_client')
+
+NAN = float('nan')
+
+
+def batch_type_curves(client, curves_by_well, chunk_size = 50, max_workers = 4):
+  # Each well's curve is a single PUT that replaces the stored curve, so wells (not points) are chunked.
+  items = list(curves_by_well.items())
+  failures = {}
+
+  def upload(item):
+    try:
+      client.batch_well_type_curve(item[0], item[1])
+    except Exception as e:
+      logger.warning('Unable to upload type curve for %s: %s', item[0], e)
+      return e
+
+  for start in range(0, len(items), chunk_size):
+    chunk = items[start:start + chunk_size]
+    for (well_id, _), failure in zip(chunk, run_concurrently(upload, chunk, max_workers)):
+      if failure is not None:
+        failures[well_id] = failure
+    logger.debug('Uploaded type curves for %s of %s wells', min(start + chunk_size, len(items)), len(items))
+  return failures
+
+
+class TypeCurves():
+  def __init__(self, dates, values):
+    self.dates = dates
+    self.values = values
+
+  def __getitem__(self, well_id):
+    return self.values[well_id]
+
+  def __contains__(self, well_id):
+    return well_id in self.values
+
+  def __len__(self):
+    return len(self.values)
+
+  def to_numpy(self):
+    import numpy
+    return numpy.array(self.dates), {well_id: numpy.frombuffer(values, dtype=numpy.float64)
+                                     for well_id, values in self.values.items()}
+
+
+class TypeCurveStore():
+  def __init__(self, client, value_field = 'value', date_field = 'date', well_field = 'well_id', cache = True,
+               ttl = None):
+    self.client = client
+    self.value_field = value_field
+    self.date_field = date_field
+    self.well_field = well_field
+    self.cache = TTLCache(ttl) if cache else None
+
+  def upload(self, curves_by_well, chunk_size = 50, max_workers = 4):
+    failures = batch_type_curves(self.client, curves_by_well, chunk_size, max_workers)
+    if self.cache is not None:
+      self.cache.clear()
+    return failures
+
+  def get(self, well_ids, start_date = None, end_date = None):
+    curves = {}
+    missing = []
+    for well_id in well_ids:
+      curve = self.cache.get((well_id, start_date, end_date)) if self.cache is not None else None
+      if curve is None:
+        missing.append(well_id)
+      else:
+        curves[well_id] = curve
+    if missing:
+      logger.debug('Fetching type curves for %s wells (%s cached)', len(missing), len(curves))
+      response = self.client.get_type_curves(well_ids=missing, start_date=start_date, end_date=end_date, combine=True)
+      grouped = dict(self._group(response))
+      for well_id in missing:
+        # Wells without a curve are cached empty so they are not requested again
+        curve = self._compact(grouped.get(well_id, []))
+        curves[well_id] = curve
+        if self.cache is not None:
+          self.cache.set((well_id, start_date, end_date), curve)
+    return self._align([(well_id, curves[well_id]) for well_id in well_ids if curves[well_id][0]])
+
+  def _group(self, response):
+    if isinstance(response, dict):
+      return response.items()
+    grouped = {}
+    for row in response or []:
+      grouped.setdefault(row[self.well_field], []).append(row)
+    return grouped.items()
+
+  def _compact(self, points):
+    date_field = self.date_field
+    value_field = self.value_field
+    points = sorted(points, key=lambda point: point[date_field])
+    values = array.array('d', (NAN if point.get(value_field) is None else point[value_field] for point in points))
+    return tuple(point[date_field] for point in points), values
+
+  def _align(self, curves):
+    if not curves:
+      return TypeCurves([], {})
+    first_dates = curves[0][1][0]
+    if all(dates == first_dates for _, (dates, _) in curves):
+      # Copied so callers cannot modify the cached arrays
+      return TypeCurves(list(first_dates), {well_id: array.array('d', values) for well_id, (_, values) in curves})
+    dates = sorted(set(date for _, (well_dates, _) in curves for date in well_dates))
+    positions = dict((date, position) for position, date in enumerate(dates))
+    aligned = {}
+    for well_id, (well_dates, values) in curves:
+      row = array.array('d', [NAN]) * len(dates)
+      for date, value in zip(well_dates, values):
+        row[positions[date]] = value
+      aligned[well_id] = row
+    return TypeCurves(dates, aligned)
@@ -1,3 +1,143 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from sotaog_public_api_client import Client, Client_Exception, ClientPool
+from sotaog_public_api_client.endpoints import ENDPOINTS
+
+
+class FakeResponse():
+  def __init__(self, status_code, body):
+    self.status_code = status_code
+    self._body = body
+
+  def json(self):
+    return self._body
+
+
+class FakeSession():
+  def __init__(self):
+    self.calls = []
+
+  def request(self, method, url, **kwargs):
+    self.calls.append((method, url, kwargs))
+    if url.endswith('/v1/authenticate'):
+      return FakeResponse(200, {'access_token': 'token'})
+    if url.endswith('/v1/datapoints'):
+      body = kwargs['json']
+      if body['asset_datatypes'] == {'list': ['response']}:
+        return FakeResponse(200, [])
+      response = {asset_id: {datatype: [body.get('limit')] for datatype in datatypes}
+                  for asset_id, datatypes in body['asset_datatypes'].items()}
+      response['meta'] = 1
+      return FakeResponse(200, response)
+    if url.endswith('/v1/customers'):
+      return FakeResponse(200, kwargs['headers'].get('x-sotaog-customer-id'))
+    return FakeResponse(404, {'message': 'Not found'})
+
+
+class TestClientRequests:
+  def test_for_customer_shares_session_and_token(self):
+    session = FakeSession()
+    client = Client('https://api.example.com/', 'id', 'secret', session=session)
+    view = client.for_customer('acme')
+    assert view.session is session
+    assert view.token == client.token
+    assert view.get_customers() == 'acme'
+    assert client.get_customers() is None
+    assert len([call for call in session.calls if call[0] == 'POST']) == 1
+
+  def test_construction_is_lazy(self):
+    session = FakeSession()
+    client = Client('https://api.example.com', 'id', 'secret', session=session)
+    assert session.calls == []
+    client.get_customers()
+    client.get_customers()
+    assert [call[0] for call in session.calls] == ['POST', 'GET', 'GET']
+
+  def test_lazy_session_is_created_on_first_request(self, monkeypatch):
+    sessions = []
+
+    class Session(FakeSession):
+      def __init__(self):
+        FakeSession.__init__(self)
+        self.mounted = []
+        sessions.append(self)
+
+      def mount(self, prefix, adapter):
+        self.mounted.append(prefix)
+
+    requests = types.ModuleType('requests')
+    requests.Session = Session
+    requests.adapters = types.ModuleType('requests.adapters')
+    requests.adapters.HTTPAdapter = lambda pool_maxsize: pool_maxsize
+    monkeypatch.setitem(sys.modules, 'requests', requests)
+    client = Client('https://api.example.com', 'id', 'secret', pool_maxsize=4)
+    results = []
+    thread = threading.Thread(target=lambda: results.append(client.get_customers()))
+    thread.daemon = True
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    assert results == [None]
+    assert len(sessions) == 1 and sessions[0].mounted == ['https://', 'http://']
+
+  def test_endpoint_dispatch(self):
+    session = FakeSession()
+    client = Client('https://api.example.com', 'id', 'secret', session=session)
+    with pytest.raises(Client_Exception, match='Unable to retrieve well production'):
+      client.list_well_production(well_ids=['w1'], start_date='2020-01-01', end_date=None)
+    method, url, kwargs = session.calls[-1]
+    assert (method, url) == ('GET', 'https://api.example.com/v1/wells/production')
+    assert kwargs['params'] == {'well_ids': ['w1'], 'start_date': '2020-01-01'}
+    with pytest.raises(Client_Exception, match='Unable to retrieve asset t1 of type tanks') as error:
+      client.get_asset('t1', type='tanks')
+    assert error.value.status_code == 404
+    assert session.calls[-1][1] == 'https://api.example.com/v1/tanks/t1'
+
+  def test_query_datapoints_groups_by_window(self):
+    session = FakeSession()
+    client = Client('https://api.example.com', 'id', 'secret', session=session)
+    results = client.query_datapoints([
+        {'asset_datatypes': {'a': ['pressure']}, 'limit': 1},
+        {'asset_datatypes': {'b': ['rate']}, 'start_ts': 10, 'end_ts': 20},
+        {'asset_datatypes': {'a': ['rate'], 'c': ['level']}, 'limit': 1},
+    ])
+    assert results == [
+        {'a': {'pressure': [1]}},
+        {'b': {'rate': [100]}},
+        {'a': {'rate': [1]}, 'c': {'level': [1]}},
+    ]
+    posts = [call for call in session.calls if call[1].endswith('/v1/datapoints')]
+    assert len(posts) == 2
+    with pytest.raises(Client_Exception, match='Unable to split datapoints response'):
+      client.query_datapoints([{'asset_datatypes': {'list': ['response']}}])
+
+  def test_headers_built_once_per_token(self):
+    client = Client('https://api.example.com', 'id', 'secret', session=FakeSession())
+    assert client._get_headers() is client._get_headers()
+    client.token = 'refreshed'
+    assert client._get_headers()['authorization'] == 'Bearer refreshed'
+
+  def test_endpoints_are_wrapped(self):
+    for name, endpoint in ENDPOINTS.items():
+      assert endpoint.verb in ('GET', 'POST', 'PUT')
+      assert hasattr(Client, name) or name == 'get_alarm_datatype'
+
+
+class TestClientPool:
+  def test_call_authenticates_once(self):
+    session = FakeSession()
+    pool = ClientPool('https://api.example.com', 'id', 'secret', max_workers=4, session=session)
+    customer_ids = ['customer-{}'.format(i) for i in range(20)]
+    results = pool.call('get_customers', customer_ids)
+    assert results == dict(zip(customer_ids, customer_ids))
+    assert len([call for call in session.calls if call[0] == 'POST']) == 1
+    assert pool.for_customer('customer-1') is pool.for_customer('customer-1')
+
+
 class TestClient:
     def test_smoke(self):
         assert True
\ No newline at end of file
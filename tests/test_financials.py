@@ -0,0 +1,65 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from sotaog_public_api_client.financials import FinancialsEngine
+
+
+class FakeClient():
+  def __init__(self):
+    self.calls = 0
+
+  def list_well_production(self, well_ids = None, facility_ids = None, start_date = None, end_date = None):
+    self.calls += 1
+    month = start_date[:7]
+    return [
+        {'well_id': 'w1', 'facility_id': 'f1', 'date': month + '-01', 'oil': 10, 'gas': 100, 'water': 5},
+        {'well_id': 'w1', 'facility_id': 'f1', 'date': month + '-02', 'oil': 10, 'gas': 100, 'water': 5},
+        {'well_id': 'w2', 'facility_id': 'f1', 'date': month + '-01', 'oil': 20, 'gas': 0, 'water': 10},
+    ]
+
+  def list_well_sales(self, well_ids = None, start_date = None, end_date = None):
+    month = start_date[:7]
+    return {'w1': [{'date': month + '-01', 'oil': 20, 'gas': 200}], 'w2': [{'date': month + '-02', 'oil': 20}],
+            'w3': [{'facility_id': 'f2', 'date': month + '-01', 'oil': 1}]}
+
+  def get_oil_gas_price(self, start_date = None, end_date = None):
+    month = start_date[:7]
+    return [{'date': month + '-01', 'oil': 50.0, 'gas': 2.0}, {'date': month + '-02', 'oil': 60.0, 'gas': 3.0}]
+
+  def get_well_financials_category_prices(self, date, well_ids = None):
+    return [
+        {'well_id': 'w1', 'unit': 'water', 'price': 1.0},
+        {'well_id': 'w2', 'unit': 'oil', 'price': 2.0},
+        {'well_id': 'w2', 'unit': None, 'price': 100.0},
+    ]
+
+  def get_financials(self, well_ids = None, facility_ids = None, start_month = None, end_month = None):
+    return [{'well_id': 'w1', 'cost': 7.0}]
+
+
+class TestFinancialsEngine:
+  def test_compute_by_well_and_facility(self):
+    engine = FinancialsEngine(FakeClient())
+    rows = {row['well']: row for row in engine.compute('2020-01', '2020-01').to_rows()}
+    assert rows['w1']['revenue'] == 20 * 50.0 + 200 * 2.0
+    assert rows['w1']['cost'] == 2 * 5 * 1.0 + 7.0
+    assert rows['w2']['revenue'] == 20 * 60.0
+    assert rows['w2']['cost'] == 20 * 2.0 + 100.0
+    assert rows['w2']['net'] == rows['w2']['revenue'] - rows['w2']['cost']
+    assert rows['w1']['facility'] == 'f1'
+    assert rows['w3']['facility'] == 'f2' and rows['w3']['revenue'] == 50.0
+
+  def test_group_by_month_and_cache(self):
+    client = FakeClient()
+    engine = FinancialsEngine(client)
+    financials = engine.compute('2019-12', '2020-02')
+    assert client.calls == 3
+    by_month = financials.group_by('month')
+    assert by_month.columns['month'].tolist() == ['2019-12', '2020-01', '2020-02']
+    assert np.allclose(by_month.columns['net'], by_month.columns['net'][0])
+    by_facility = financials.group_by('facility')
+    assert by_facility.columns['facility'].tolist() == ['f1', 'f2']
+    assert by_facility.columns['revenue'].tolist() == [3 * (1400.0 + 1200.0), 3 * 50.0]
+    engine.compute('2020-01', '2020-02')
+    assert client.calls == 3
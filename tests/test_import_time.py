@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+IMPORT_BUDGET = float(os.getenv('SOTAOG_IMPORT_BUDGET', '0.5'))
+LAZY_MODULES = ['requests', 'csv', 'concurrent.futures', 'numpy']
+
+SCRIPT = '''
+import json, sys, timeit
+start = timeit.default_timer()
+import sotaog_public_api_client
+elapsed = timeit.default_timer() - start
+sotaog_public_api_client.Client('https://api.example.com', 'id', 'secret')
+print(json.dumps({'elapsed': elapsed, 'modules': sorted(sys.modules)}))
+'''
+
+
+def measure_import():
+  root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+  output = subprocess.check_output([sys.executable, '-c', SCRIPT], cwd=root)
+  return json.loads(output.decode())
+
+
+class TestImportTime:
+  def test_import_time(self):
+    runs = [measure_import() for _ in range(3)]
+    elapsed = min(run['elapsed'] for run in runs)
+    assert elapsed < IMPORT_BUDGET, 'import took {:.3f}s'.format(elapsed)
+
+  def test_heavy_modules_are_lazy(self):
+    modules = set(measure_import()['modules'])
+    assert [module for module in LAZY_MODULES if module in modules] == []
@@ -0,0 +1,66 @@
+import threading
+import time
+
+import pytest
+
+from sotaog_public_api_client import Client_Exception
+from sotaog_public_api_client.prefetch import PrefetchPlanner
+
+
+class FakeClient():
+  def __init__(self, delay = 0.0):
+    self.delay = delay
+    self.calls = []
+    self.active = 0
+    self.peak = 0
+    self._lock = threading.Lock()
+
+  def _analysis(self, name, well_id, refresh):
+    with self._lock:
+      self.calls.append((name, well_id, refresh))
+      self.active += 1
+      self.peak = max(self.peak, self.active)
+    time.sleep(self.delay)
+    with self._lock:
+      self.active -= 1
+    if well_id == 'bad':
+      raise Client_Exception('Unable to retrieve {}'.format(name))
+    return {'well_id': well_id, 'analysis': name}
+
+  def get_well_tpr_ipr_curve(self, well_id, refresh):
+    return self._analysis('tpr_ipr', well_id, refresh)
+
+  def get_res_mgmt_plots(self, well_id, refresh):
+    return self._analysis('res_mgmt', well_id, refresh)
+
+  def get_flowing_bottom_hole_pressure(self, well_id, refresh):
+    return self._analysis('fbhp', well_id, refresh)
+
+  def get_critical_rate_analysis(self, well_id, refresh = None):
+    return self._analysis('critical_rate', well_id, refresh)
+
+
+class TestPrefetchPlanner:
+  def test_warm_respects_concurrency_cap(self):
+    client = FakeClient(delay=0.01)
+    planner = PrefetchPlanner(client, max_workers=3)
+    failures = planner.warm(well_id for well_id in ['w0', 'w1', 'w2', 'w3', 'w4', 'bad'])
+    assert client.peak <= 3
+    assert len(client.calls) == 24
+    assert all(refresh is True for _, _, refresh in client.calls)
+    assert sorted(failures) == sorted((analysis, 'bad') for analysis in planner.analyses)
+    assert planner.plan(['w1']) == []
+
+  def test_report_reads_from_cache(self):
+    client = FakeClient()
+    planner = PrefetchPlanner(client, analyses=['tpr_ipr_curve'])
+    planner.warm(['w1'])
+    assert planner.report(['w1'], fetch=False) == {'w1': {'tpr_ipr_curve': {'well_id': 'w1', 'analysis': 'tpr_ipr'}}}
+    assert len(client.calls) == 1
+    with pytest.raises(KeyError):
+      planner.get('tpr_ipr_curve', 'w2', fetch=False)
+
+  def test_entries_expire(self):
+    planner = PrefetchPlanner(FakeClient(), ttl=0)
+    planner.warm(['w1'])
+    assert planner.plan(['w1']) != []
@@ -0,0 +1,59 @@
+import json
+import math
+
+import pytest
+
+from sotaog_public_api_client import Client, Client_Exception
+from sotaog_public_api_client.records import Record, object_pairs_hook, to_columns
+
+ROWS = [
+    {'well_id': 'w1', 'date': '2020-01-01', 'oil': 10, 'gas': 1.5, 'meta': {'source': 'scada'}},
+    {'well_id': 'w2', 'date': '2020-01-01', 'oil': None, 'gas': 2.5, 'meta': {'source': 'scada'}},
+]
+
+
+class FakeResponse():
+  status_code = 200
+  content = json.dumps(ROWS).encode('utf-8')
+
+  def json(self, **kwargs):
+    return json.loads(self.content.decode('utf-8'), **kwargs)
+
+
+class FakeSession():
+  def request(self, method, url, **kwargs):
+    return FakeResponse()
+
+
+class TestRecords:
+  def test_object_pairs_hook_builds_slotted_records(self):
+    rows = json.loads(json.dumps(ROWS), object_pairs_hook=object_pairs_hook)
+    assert isinstance(rows[0], Record)
+    assert type(rows[0]) is type(rows[1])
+    assert not hasattr(rows[0], '__dict__')
+    assert rows[0].well_id == 'w1' and rows[0]['oil'] == 10 and rows[1].meta.source == 'scada'
+    assert rows[0].date is rows[1].date
+    assert rows[0] == {'well_id': 'w1', 'date': '2020-01-01', 'oil': 10, 'gas': 1.5, 'meta': rows[0].meta}
+
+  def test_invalid_field_names_stay_dicts(self):
+    row = json.loads('{"well id": 1, "class": 2}', object_pairs_hook=object_pairs_hook)
+    assert row == {'well id': 1, 'class': 2} and isinstance(row, dict)
+    rows = json.loads('[{"id": 1, "keys": "abc", "get": 2}]', object_pairs_hook=object_pairs_hook)
+    assert isinstance(rows[0], dict)
+    assert list(to_columns(rows)['keys']) == ['abc']
+
+  def test_to_columns(self):
+    columns = to_columns(ROWS)
+    assert len(columns) == 2
+    assert columns['oil'].typecode == 'd' and math.isnan(columns['oil'][1])
+    assert list(columns['gas']) == [1.5, 2.5]
+    assert columns['well_id'] == ['w1', 'w2']
+
+  def test_client_record_modes(self):
+    client = Client('https://api.example.com', 'id', 'secret', session=FakeSession())
+    client.token = 'token'
+    assert client.list_report_tank_gauge() == ROWS
+    assert client.list_report_tank_gauge(record_mode='records')[0].well_id == 'w1'
+    assert list(client.list_monthly_oil_report(record_mode='columns')['gas']) == [1.5, 2.5]
+    with pytest.raises(Client_Exception, match='Unknown record_mode'):
+      client.list_report_tank_gauge(record_mode='column')
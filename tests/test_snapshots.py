@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from sotaog_public_api_client import Client
+from sotaog_public_api_client.snapshots import SnapshotCache
+
+
+class FakeClient():
+  def __init__(self):
+    self.status = [{'well_id': 'w1', 'status': 'on'}, {'well_id': 'w2', 'status': 'on'}]
+    self.predicted = {'w1': 10, 'w2': 20}
+    self.refreshed = threading.Event()
+
+  def list_well_status(self, well_ids = None):
+    return list(self.status)
+
+  def get_today_predicted(self, well_ids = None, refresh = False):
+    self.refreshed.set()
+    return dict(self.predicted)
+
+
+class TestSnapshotCache:
+  def test_subsets_are_served_from_index(self):
+    cache = SnapshotCache(FakeClient())
+    assert cache.well_status() is None
+    cache.refresh()
+    assert cache.well_status(['w2', 'w3']) == [{'well_id': 'w2', 'status': 'on'}]
+    assert cache.today_predicted(['w1']) == {'w1': 10}
+    assert len(cache.well_status()) == 2
+
+  def test_on_change_receives_diffs(self):
+    client = FakeClient()
+    changes = []
+    cache = SnapshotCache(client, on_change=lambda name, diff: changes.append((name, diff)))
+    cache.refresh()
+    del changes[:]
+    client.status = [{'well_id': 'w1', 'status': 'off'}]
+    cache.refresh()
+    assert changes == [('well_status', {'w1': {'well_id': 'w1', 'status': 'off'}, 'w2': None})]
+
+  def test_background_refresh(self):
+    client = FakeClient()
+    cache = SnapshotCache(client, interval=60).start()
+    try:
+      assert client.refreshed.wait(5)
+    finally:
+      cache.stop()
+    assert cache.today_predicted() == {'w1': 10, 'w2': 20}
+
+  def test_failing_on_change_does_not_stop_refresh(self):
+    client = FakeClient()
+
+    def on_change(name, changes):
+      raise RuntimeError('callback failed')
+
+    cache = SnapshotCache(client, on_change=on_change)
+    cache.refresh()
+    client.status = [{'well_id': 'w3', 'status': 'on'}]
+    cache.refresh()
+    assert cache.well_status(['w3']) == [{'well_id': 'w3', 'status': 'on'}]
+
+  def test_client_snapshot_cache_rejects_new_arguments(self):
+    client = Client('https://api.example.com', 'id', 'secret')
+    client._snapshot_cache = SnapshotCache(FakeClient(), interval=5)
+    assert client.snapshot_cache() is client._snapshot_cache
+    assert client.snapshot_cache(interval=5) is client._snapshot_cache
+    with pytest.raises(ValueError):
+      client.snapshot_cache(interval=10)
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+
+from sotaog_public_api_client import Client_Exception
+from sotaog_public_api_client.spool import WriteQueue
+
+
+class FakeClient():
+  def __init__(self, failures = 0, rejected = ()):
+    self.failures = failures
+    self.rejected = rejected
+    self.calls = []
+    self.available = threading.Event()
+    self.available.set()
+
+  def _write(self, method, *args):
+    self.available.wait()
+    payload = args[-1] if isinstance(args[-1], list) else [args[-1]]
+    if any(item in self.rejected for item in payload):
+      raise Client_Exception('Unable to write', status_code=400)
+    if self.failures:
+      self.failures -= 1
+      raise Client_Exception('Unable to post datapoints')
+    self.calls.append((method,) + args)
+
+  def post_datapoints(self, asset_id, datapoints):
+    self._write('post_datapoints', asset_id, datapoints)
+
+  def put_alarm(self, asset_id, datatype, alarm):
+    self._write('put_alarm', asset_id, datatype, alarm)
+
+
+class TestWriteQueue:
+  def test_batches_per_asset_in_order(self, tmp_path):
+    client = FakeClient()
+    client.available.clear()
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'))
+    queue.post_datapoints('a1', [1])
+    queue.post_datapoints('a1', [2])
+    queue.post_datapoints('a2', [3])
+    queue.put_alarm('a1', 'pressure', {'high': 10})
+    queue.post_datapoints('a1', [4])
+    client.available.set()
+    assert queue.flush(5)
+    queue.close()
+    a1 = [call for call in client.calls if call[1] == 'a1']
+    assert a1[-2:] == [('put_alarm', 'a1', 'pressure', {'high': 10}), ('post_datapoints', 'a1', [4])]
+    assert ('post_datapoints', 'a2', [3]) in client.calls
+    assert sum(len(call[2]) for call in client.calls if call[0] == 'post_datapoints') == 4
+    assert (tmp_path / 'spool.log').read_text() == ''
+
+  def test_retries_failed_writes(self, tmp_path):
+    client = FakeClient(failures=2)
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'), retry_interval=0.01)
+    queue.post_datapoints('a1', [1])
+    assert queue.flush(5)
+    queue.close()
+    assert client.calls == [('post_datapoints', 'a1', [1])]
+
+  def test_spool_survives_restart(self, tmp_path):
+    path = str(tmp_path / 'spool.log')
+    queue = WriteQueue(FakeClient(failures=1), path, retry_interval=60)
+    queue.post_datapoints('a1', [1])
+    queue.post_datapoints('a1', [2])
+    queue.close()
+
+    client = FakeClient()
+    queue = WriteQueue(client, path, max_rate=100)
+    assert queue.flush(5)
+    queue.close()
+    assert client.calls == [('post_datapoints', 'a1', [1, 2])]
+
+  def test_rejected_writes_are_dead_lettered(self, tmp_path):
+    client = FakeClient(rejected=[{'high': 'bad'}, 2])
+    client.available.clear()
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'), retry_interval=60)
+    queue.put_alarm('a1', 'pressure', {'high': 'bad'})
+    queue.post_datapoints('a1', [1])
+    queue.post_datapoints('a1', [2])
+    queue.post_datapoints('a1', [3])
+    client.available.set()
+    assert queue.flush(5)
+    queue.close()
+    assert client.calls == [('post_datapoints', 'a1', [1]), ('post_datapoints', 'a1', [3])]
+    dead_letters = [json.loads(line) for line in (tmp_path / 'spool.log.dead').read_text().splitlines()]
+    assert [(entry['method'], entry['status_code']) for entry in dead_letters] == [('put_alarm', 400),
+                                                                                   ('post_datapoints', 400)]
+    assert (tmp_path / 'spool.log').read_text() == ''
+
+  def test_gives_up_after_max_attempts(self, tmp_path):
+    client = FakeClient(failures=6)
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'), retry_interval=0.01, max_attempts=3)
+    queue.post_datapoints('a1', [1])
+    assert queue.flush(5)
+    queue.post_datapoints('a1', [2])
+    assert queue.flush(5)
+    queue.close()
+    assert client.calls == []
+    assert len((tmp_path / 'spool.log.dead').read_text().splitlines()) == 2
+
+  def test_acks_a_batch_with_one_fsync(self, tmp_path, monkeypatch):
+    fsyncs = []
+    monkeypatch.setattr(os, 'fsync', fsyncs.append)
+    client = FakeClient()
+    client.available.clear()
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'))
+    for value in range(3):
+      queue.post_datapoints('a1', [value])
+    client.available.set()
+    assert queue.flush(5)
+    queue.close()
+    assert client.calls == [('post_datapoints', 'a1', [0, 1, 2])]
+    assert len(fsyncs) == 4
+
+  def test_rate_limits_only_backlog(self, tmp_path):
+    client = FakeClient()
+    queue = WriteQueue(client, str(tmp_path / 'spool.log'), max_rate=1, backlog=5)
+    for asset_id in range(5):
+      queue.put_alarm('a{}'.format(asset_id), 'pressure', {'high': 10})
+    assert queue.flush(2)
+    client.available.clear()
+    for asset_id in range(12):
+      queue.put_alarm('b{}'.format(asset_id), 'pressure', {'high': 10})
+    client.available.set()
+    assert not queue.flush(1)
+    queue.close()
@@ -0,0 +1,50 @@
+import json
+import zipfile
+
+import pytest
+
+from sotaog_public_api_client import Client, Client_Exception
+from sotaog_public_api_client.transport import RecordingTransport, ReplayTransport
+
+
+class FakeResponse():
+  def __init__(self, status_code, body):
+    self.status_code = status_code
+    self.content = json.dumps(body).encode('utf-8')
+    self.headers = {'content-type': 'application/json'}
+
+  def json(self):
+    return json.loads(self.content.decode('utf-8'))
+
+
+class FakeSession():
+  def __init__(self):
+    self.count = 0
+
+  def request(self, method, url, **kwargs):
+    if url.endswith('/v1/authenticate'):
+      return FakeResponse(200, {'access_token': 'token'})
+    self.count += 1
+    return FakeResponse(200, {'url': url, 'params': kwargs['params'], 'count': self.count})
+
+
+class TestTransport:
+  def test_record_and_replay(self, tmp_path):
+    path = str(tmp_path / 'archive.zip')
+    with RecordingTransport(path, session=FakeSession()) as transport:
+      client = Client('https://api.example.com', 'id', 'secret', session=transport)
+      recorded = [client.list_well_status(well_ids=['w1']), client.list_well_status(well_ids=['w1']),
+                  client.for_customer('acme').get_facilities()]
+
+    with ReplayTransport(path) as transport:
+      client = Client('https://api.example.com', 'other', 'credentials', session=transport)
+      replayed = [client.list_well_status(well_ids=['w1']), client.list_well_status(well_ids=['w1']),
+                  client.for_customer('acme').get_facilities()]
+      assert client.list_well_status(well_ids=['w1']) == recorded[1]
+      with pytest.raises(Client_Exception, match='No recorded response'):
+        client.get_facilities()
+    assert replayed == recorded
+    with zipfile.ZipFile(path) as archive:
+      assert not any(b'"token"' in archive.read(name) for name in archive.namelist())
+      assert client.token == 'recorded-token'
+    assert recorded[0]['count'] != recorded[1]['count']
@@ -0,0 +1,55 @@
+import math
+
+from sotaog_public_api_client import Client_Exception
+from sotaog_public_api_client.type_curves import TypeCurveStore, batch_type_curves
+
+
+class FakeClient():
+  def __init__(self):
+    self.uploaded = {}
+    self.requests = []
+
+  def batch_well_type_curve(self, well_id, curves):
+    if well_id == 'bad':
+      raise Client_Exception('Unable to create well type curves')
+    self.uploaded[well_id] = curves
+
+  def get_type_curves(self, well_ids = None, start_date = None, end_date = None, combine = True):
+    self.requests.append(list(well_ids))
+    curves = {
+        'w1': [{'date': '2020-01-02', 'value': 2.0}, {'date': '2020-01-01', 'value': 1.0}],
+        'w2': [{'date': '2020-01-01', 'value': 3.0}],
+    }
+    return {well_id: curves[well_id] for well_id in well_ids if well_id in curves}
+
+
+class TestTypeCurves:
+  def test_batch_upload_in_chunks(self):
+    client = FakeClient()
+    curves = dict(('w{}'.format(i), [{'date': '2020-01-01', 'value': i}]) for i in range(7))
+    curves['bad'] = []
+    failures = batch_type_curves(client, curves, chunk_size=3, max_workers=2)
+    assert list(failures) == ['bad']
+    assert sorted(client.uploaded) == sorted(well_id for well_id in curves if well_id != 'bad')
+
+  def test_get_returns_aligned_arrays_and_caches(self):
+    client = FakeClient()
+    store = TypeCurveStore(client)
+    curves = store.get(['w1', 'w2'], '2020-01-01', '2020-01-31')
+    assert curves.dates == ['2020-01-01', '2020-01-02']
+    assert list(curves['w1']) == [1.0, 2.0]
+    assert curves['w2'][0] == 3.0 and math.isnan(curves['w2'][1])
+    assert curves['w1'].typecode == 'd'
+    store.get(['w1', 'w2'], '2020-01-01', '2020-01-31')
+    store.get(['w1'], '2020-02-01', '2020-02-28')
+    assert client.requests == [['w1', 'w2'], ['w1']]
+
+  def test_missing_wells_are_cached_and_results_are_copies(self):
+    client = FakeClient()
+    store = TypeCurveStore(client)
+    curves = store.get(['w2', 'w3'])
+    assert 'w3' not in curves
+    curves['w2'][0] = 0.0
+    curves = store.get(['w2', 'w3'])
+    assert 'w3' not in curves and curves['w2'][0] == 3.0
+    assert client.requests == [['w2', 'w3']]